@@ -0,0 +1,79 @@
+"""Benchmark block hash caching during validation.
+
+Counts SHA3 invocations and time for a typical receive path: from_dict with
+hash check, verify, to_dict and a few block.hash lookups as done by the P2P
+code. UncachedBlock hashes the way Block.hash used to, re-serializing the
+header on every access.
+
+Run from talantchainpy/: python -m benchmarks.bench_block_hash
+"""
+
+import time
+from talantchain.core.block import Block
+from talantchain.crypto.hash import Hash
+
+ROUNDS = 20000
+
+class UncachedBlock(Block):
+    @property
+    def hash(self) -> Hash:
+        header = self.header
+        return Hash(
+            header.version.to_bytes(4, 'little') +
+            bytes(header.prev_hash) +
+            bytes(header.merkle_root) +
+            header.timestamp.to_bytes(8, 'little') +
+            header.difficulty.to_bytes(4, 'little') +
+            header.nonce.to_bytes(4, 'little')
+        )
+
+class CountingHash:
+    """Count calls to Hash._hash"""
+
+    def __init__(self):
+        self.calls = 0
+        self._original = Hash._hash
+
+    def __enter__(self):
+        original = self._original
+
+        def counted(data):
+            self.calls += 1
+            return original(data)
+
+        Hash._hash = staticmethod(counted)
+        return self
+
+    def __exit__(self, *exc):
+        Hash._hash = staticmethod(self._original)
+
+def mined_block() -> dict:
+    """Get a block dict with valid proof of work at difficulty 1"""
+    block = Block.create_genesis_block()
+    while not block.meets_difficulty(1):
+        block.header.nonce += 1
+    return block.to_dict()
+
+def validate(cls, data: dict):
+    block = cls.from_dict(data)
+    block.verify()
+    block.to_dict()
+    for _ in range(3):
+        block.hash.hex()
+
+def run(cls, data: dict):
+    with CountingHash() as counter:
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            validate(cls, data)
+        elapsed = time.perf_counter() - start
+    print(f"{cls.__name__:14} {counter.calls / ROUNDS:4.1f} hashes/validation "
+          f"{ROUNDS / elapsed:10,.0f} validations/s")
+
+def main():
+    data = mined_block()
+    run(UncachedBlock, data)
+    run(Block, data)
+
+if __name__ == '__main__':
+    main()
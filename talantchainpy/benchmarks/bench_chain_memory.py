@@ -0,0 +1,152 @@
+"""Benchmark memory held by an in-memory chain.
+
+Builds BLOCKS blocks with TXS_PER_BLOCK transactions each, the way
+Blockchain.chain holds them, and reports traced bytes per block and per
+transaction. Addresses are decoded fresh for every transaction, as they
+would be when parsed off the network, drawn from a pool of ADDRESSES.
+
+LegacyHash, LegacyBlockHeader and LegacyTransaction hold the same fields
+the way the core classes did before they used __slots__: in a per-instance
+__dict__, with caches set by __setattr__ and addresses not interned. Both
+are measured and printed side by side.
+
+Run from talantchainpy/: python -m benchmarks.bench_chain_memory
+"""
+
+import gc
+import hashlib
+import os
+import tracemalloc
+from dataclasses import dataclass
+from decimal import Decimal
+from talantchain.core.block import HEADER_STRUCT, Block, BlockHeader
+from talantchain.core.transaction import Transaction
+from talantchain.crypto.hash import Hash
+
+BLOCKS = 100000
+TXS_PER_BLOCK = 2
+ADDRESSES = 1000
+
+class LegacyHash:
+    def __init__(self, data: bytes = None):
+        self._bytes = bytes(32) if data is None else hashlib.sha3_256(data).digest()
+
+    @staticmethod
+    def from_hex(s: str) -> 'LegacyHash':
+        h = LegacyHash()
+        h._bytes = bytes.fromhex(s)
+        return h
+
+@dataclass
+class LegacyBlockHeader:
+    version: int
+    prev_hash: LegacyHash
+    merkle_root: LegacyHash
+    timestamp: int
+    difficulty: int
+    nonce: int
+
+    _serialized = None
+    _hash = None
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in self.__dataclass_fields__:
+            object.__setattr__(self, '_serialized', None)
+            object.__setattr__(self, '_hash', None)
+
+    @property
+    def hash(self) -> LegacyHash:
+        if self._hash is None:
+            self._serialized = HEADER_STRUCT.pack(
+                self.version, self.prev_hash._bytes, self.merkle_root._bytes,
+                self.timestamp, self.difficulty, self.nonce
+            )
+            self._hash = LegacyHash(self._serialized)
+        return self._hash
+
+class LegacyTransaction:
+    _ENCODED_FIELDS = frozenset(('sender', 'recipient', 'amount', 'timestamp', 'signature', 'fee'))
+
+    def __init__(self, sender, recipient, amount, timestamp=None, signature=None,
+                 fee=Decimal('0')):
+        self.sender = sender
+        self.recipient = recipient
+        self.amount = amount
+        self.timestamp = timestamp
+        self.signature = signature
+        self.fee = fee
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in self._ENCODED_FIELDS:
+            if name != 'signature':
+                object.__setattr__(self, '_unsigned', None)
+                object.__setattr__(self, '_hash_bytes', None)
+                object.__setattr__(self, '_hash', None)
+            object.__setattr__(self, '_signed', None)
+
+LEGACY = (LegacyHash, LegacyBlockHeader, LegacyTransaction)
+SLOTTED = (Hash, BlockHeader, Transaction)
+
+def make_transactions(classes, count: int, addresses: list) -> list:
+    transaction = classes[2]
+    return [
+        transaction(
+            sender=addresses[i % ADDRESSES].decode(),
+            recipient=addresses[(i * 7 + 1) % ADDRESSES].decode(),
+            amount=Decimal('1.5'),
+            timestamp=1700000000 + i,
+            signature='5' * 88
+        )
+        for i in range(count)
+    ]
+
+def make_block(classes, height: int, transactions: list) -> Block:
+    hash_cls, header_cls, _ = classes
+    header = header_cls(
+        version=1,
+        prev_hash=hash_cls.from_hex(os.urandom(32).hex()),
+        merkle_root=hash_cls.from_hex(os.urandom(32).hex()),
+        timestamp=1700000000 + height * 60,
+        difficulty=10,
+        nonce=height
+    )
+    block = Block(header=header, transactions=transactions)
+    block.hash  # Cached hash is part of what a validated chain keeps
+    return block
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del kept
+    return used
+
+def main():
+    addresses = [f"TLNT{i:060x}".encode() for i in range(ADDRESSES)]
+    txs = BLOCKS * TXS_PER_BLOCK
+
+    results = []
+    for classes in (LEGACY, SLOTTED):
+        tx_bytes = measure(lambda: make_transactions(classes, txs, addresses))
+        chain_bytes = measure(lambda: [
+            make_block(classes, height, make_transactions(classes, TXS_PER_BLOCK, addresses))
+            for height in range(BLOCKS)
+        ])
+        results.append((tx_bytes, chain_bytes))
+    (legacy_tx, legacy_chain), (tx_bytes, chain_bytes) = results
+
+    print(f"{BLOCKS:,} blocks, {txs:,} transactions")
+    print(f"  {'':16} {'before':>8} {'after':>8}")
+    print(f"  per transaction {legacy_tx / txs:8,.0f} {tx_bytes / txs:8,.0f} bytes")
+    print(f"  per block       {legacy_chain / BLOCKS:8,.0f} {chain_bytes / BLOCKS:8,.0f} bytes"
+          f" (including its transactions)")
+    print(f"  total           {legacy_chain / 2 ** 20:8,.1f} {chain_bytes / 2 ** 20:8,.1f} MiB")
+
+if __name__ == '__main__':
+    main()
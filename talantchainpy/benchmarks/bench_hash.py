@@ -0,0 +1,76 @@
+"""Benchmark the Hash primitive.
+
+LegacyHash hashes the way Hash used to: a cryptography hashes.Hash object
+per call, a fresh zero buffer for Hash(), and a Hash() allocation before
+assigning raw bytes. Inputs are the sizes hashed most often: an 80-byte
+block header, a 64-byte Merkle node pair and a ~200-byte transaction JSON.
+
+Run from talantchainpy/: python -m benchmarks.bench_hash
+"""
+
+import json
+import os
+import time
+from cryptography.hazmat.primitives import hashes
+from talantchain.crypto.hash import Hash, hash_many
+
+ROUNDS = 200000
+BATCH = 1000
+
+class LegacyHash(Hash):
+    __slots__ = ()
+
+    def __init__(self, data=None):
+        self._bytes = bytes(self.SIZE) if data is None else self._hash(data)
+
+    @staticmethod
+    def _hash(data):
+        if isinstance(data, str):
+            data = data.encode()
+        digest = hashes.Hash(hashes.SHA3_256())
+        digest.update(data)
+        return digest.finalize()
+
+    @classmethod
+    def from_bytes(cls, data):
+        h = cls()
+        h._bytes = data
+        return h
+
+def timed(func, rounds: int = ROUNDS) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return rounds / (time.perf_counter() - start)
+
+def main():
+    header = os.urandom(80)
+    node = os.urandom(64)
+    tx = json.dumps({
+        'sender': 'T' + 'a' * 63, 'recipient': 'T' + 'b' * 63,
+        'amount': '12.50000000', 'timestamp': 1700000000
+    })
+    digest = os.urandom(32)
+    assert bytes(LegacyHash(header)) == bytes(Hash(header))
+    assert bytes(LegacyHash(tx)) == bytes(Hash(tx))
+
+    cases = [
+        ('header (80 B)', lambda cls: (lambda: cls(header))),
+        ('merkle node (64 B)', lambda cls: (lambda: cls(node))),
+        ('tx json (str)', lambda cls: (lambda: cls(tx))),
+        ('zero Hash()', lambda cls: (lambda: cls())),
+        ('from_bytes', lambda cls: (lambda: cls.from_bytes(digest))),
+    ]
+    print(f"{'':20} {'LegacyHash':>14} {'Hash':>14}")
+    for name, make in cases:
+        legacy = timed(make(LegacyHash))
+        fast = timed(make(Hash))
+        print(f"{name:20} {legacy:12,.0f}/s {fast:12,.0f}/s  {fast / legacy:4.1f}x")
+
+    items = [header] * BATCH
+    legacy = timed(lambda: [LegacyHash(item) for item in items], ROUNDS // BATCH) * BATCH
+    fast = timed(lambda: hash_many(items), ROUNDS // BATCH) * BATCH
+    print(f"{'hash_many (80 B)':20} {legacy:12,.0f}/s {fast:12,.0f}/s  {fast / legacy:4.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark ring signature sign, verify and batch verify.
+
+LegacyRingSignature signs and verifies the way RingSignature used to: fresh
+h + s_i concatenations per member, a generator XOR, and every member hashed
+twice in verify. It derives key images with its own copy of the original
+generate_key_image, and the outputs are checked to be identical before
+timing.
+
+Verify stops at the first member whose digest differs from its c, so it is
+timed on a ring of equal s values, which walks every member.
+
+Run from talantchainpy/: python -m benchmarks.bench_ring_signature
+"""
+
+import os
+import random
+import time
+from unittest import mock
+from nacl.bindings import crypto_scalarmult_base
+from nacl.hash import blake2b
+from talantchain.crypto.ring_signature import RingSignature
+
+RING_SIZES = (11, 64, 256)
+BATCH = 100
+MESSAGE = b"benchmark transaction"
+
+class LegacyRingSignature(RingSignature):
+    @staticmethod
+    def generate_key_image(private_key, public_key):
+        hp = blake2b(public_key, digest_size=32)
+        return crypto_scalarmult_base(hp)
+
+    @staticmethod
+    def sign(message, public_keys, private_key, key_index):
+        n = len(public_keys)
+        alpha = os.urandom(32)
+        s = [os.urandom(32) for _ in range(n)]
+        key_image = LegacyRingSignature.generate_key_image(private_key, public_keys[key_index])
+        c = [bytes(32) for _ in range(n)]
+        h = blake2b(message + key_image, digest_size=32)
+        for i in range(n):
+            if i == key_index:
+                continue
+            c[(i + 1) % n] = blake2b(h + s[i], digest_size=32)
+        s[key_index] = alpha
+        for i in range(n):
+            if i != key_index:
+                s[i] = bytes(x ^ y for x, y in zip(s[i], c[i]))
+        return s, key_image
+
+    @staticmethod
+    def verify(message, public_keys, signature):
+        s_values, key_image = signature
+        n = len(public_keys)
+        if len(s_values) != n:
+            return False
+        h = blake2b(message + key_image, digest_size=32)
+        c = [bytes(32) for _ in range(n)]
+        for i in range(n):
+            c[(i + 1) % n] = blake2b(h + s_values[i], digest_size=32)
+        return all(c[i] == blake2b(h + s_values[i], digest_size=32) for i in range(n))
+
+def seeded_sign(cls, seed, *args):
+    """Sign with os.urandom drawn from a seeded generator"""
+    rng = random.Random(seed)
+    with mock.patch('os.urandom', rng.randbytes):
+        return cls.sign(*args)
+
+def check_equivalence(public_keys, private_key):
+    n = len(public_keys)
+    for key_index in {0, 1, n // 2, n - 1}:
+        args = (MESSAGE, public_keys, private_key, key_index)
+        legacy = seeded_sign(LegacyRingSignature, key_index, *args)
+        fast = seeded_sign(RingSignature, key_index, *args)
+        assert legacy == fast, f"sign differs at ring size {n}"
+        for signature in (fast, ([bytes(32)] * n, fast[1])):
+            assert (LegacyRingSignature.verify(MESSAGE, public_keys, signature) ==
+                    RingSignature.verify(MESSAGE, public_keys, signature))
+
+def timed(func, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return rounds / (time.perf_counter() - start)
+
+def main():
+    for n in RING_SIZES:
+        keys = [RingSignature.generate_key_pair() for _ in range(n)]
+        public_keys = [public for _, public in keys]
+        private_key = keys[n // 2][0]
+        check_equivalence(public_keys, private_key)
+
+        rounds = max(20, 20000 // n)
+        signature = RingSignature.sign(MESSAGE, public_keys, private_key, n // 2)
+        signature = ([bytes(32)] * n, signature[1])  # Full walk, see above
+        batch = [(MESSAGE, public_keys, signature)] * BATCH
+        print(f"ring size {n}")
+        for cls in (LegacyRingSignature, RingSignature):
+            sign = timed(lambda: cls.sign(MESSAGE, public_keys, private_key, n // 2), rounds)
+            verify = timed(lambda: cls.verify(MESSAGE, public_keys, signature), rounds)
+            print(f"  {cls.__name__:20} sign {sign:9,.0f}/s  verify {verify:9,.0f}/s")
+        batch_rate = timed(lambda: RingSignature.verify_batch(batch), max(1, rounds // BATCH)) * BATCH
+        print(f"  {'verify_batch':20} {batch_rate:24,.0f}/s")
+
+if __name__ == '__main__':
+    main()
@@ -11,7 +11,8 @@ setup(
         "pydantic",
         "uvicorn",
         "aiohttp",
-        "base58"
+        "base58",
+        "sortedcontainers"
     ],
     entry_points={
         'console_scripts': [
@@ -1,6 +1,7 @@
 """Command line interface for TalantChain"""
 
 import os
+import time
 import click
 import getpass
 from decimal import Decimal
@@ -10,6 +11,10 @@ from .pool.miner import PoolMiner
 from .pool.server import MiningPool
 from .pool.web import PoolWebServer, PoolConfig
 from .wallet.wallet import Wallet
+from .database.db import Database
+from .units import format_amount
+from .database.bootstrap import export_chain, import_chain
+from .database.snapshot import rebuild_state, verify_state, write_snapshot
 
 @click.group()
 def cli():
@@ -133,5 +138,71 @@ def listwallets():
     for wallet in wallets:
         click.echo(f"- {wallet}")
 
+@cli.command('export-chain')
+@click.argument('path')
+@click.option('--db', 'db_path', default='blockchain.db', help='Node database file')
+def export_chain_cmd(path, db_path):
+    """Export the chain to a bootstrap file"""
+    start = time.time()
+    count = export_chain(Database(db_path), path)
+    elapsed = time.time() - start
+    click.echo(f"Exported {count} blocks to {path} in {elapsed:.1f}s")
+
+@cli.command('import-chain')
+@click.argument('path')
+@click.option('--db', 'db_path', default='blockchain.db', help='Node database file')
+@click.option('--batch-size', type=int, default=1000, help='Blocks per transaction')
+def import_chain_cmd(path, db_path, batch_size):
+    """Import the chain from a bootstrap file (node must be stopped)"""
+    start = time.time()
+
+    def progress(count):
+        elapsed = time.time() - start
+        click.echo(f"\rImported {count} blocks ({count / elapsed:,.0f} blocks/s)", nl=False)
+
+    try:
+        count = import_chain(Database(db_path), path, batch_size, progress)
+    except Exception as e:
+        click.echo(f"\nError importing chain: {str(e)}")
+        return
+
+    elapsed = time.time() - start
+    rate = count / elapsed if elapsed > 0 else 0
+    click.echo(f"\nImported {count} blocks in {elapsed:.1f}s ({rate:,.0f} blocks/s)")
+
+@cli.command()
+@click.option('--db', 'db_path', default='blockchain.db', help='Node database file')
+def snapshot(db_path):
+    """Write a balance snapshot"""
+    path = write_snapshot(Database(db_path))
+    click.echo(f"Snapshot written to {path}")
+
+@cli.command('rebuild-state')
+@click.option('--db', 'db_path', default='blockchain.db', help='Node database file')
+def rebuild_state_cmd(db_path):
+    """Rebuild balances from the latest snapshot (node must be stopped)"""
+    start = time.time()
+    height, replayed = rebuild_state(Database(db_path))
+    elapsed = time.time() - start
+    click.echo(f"Restored snapshot at height {height}, replayed {replayed} blocks in {elapsed:.1f}s")
+
+@cli.command('verify-state')
+@click.option('--db', 'db_path', default='blockchain.db', help='Node database file')
+@click.option('--workers', type=int, default=4, help='Parallel replay workers')
+def verify_state_cmd(db_path, workers):
+    """Check balances against a full replay of the chain"""
+    mismatches = verify_state(Database(db_path), workers)
+    if not mismatches:
+        click.echo("Balances match the chain")
+        return
+
+    click.echo(f"{len(mismatches)} balances differ from the chain:")
+    for address, actual, expected in mismatches:
+        click.echo(f"- {address}: {format_amount(actual)} (expected {format_amount(expected)})")
+
+def main():
+    """Console script entry point"""
+    cli()
+
 if __name__ == '__main__':
     cli()
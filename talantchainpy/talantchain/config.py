@@ -28,6 +28,9 @@ def get_data_dir() -> Path:
 # Node state file
 NODE_STATE_FILE = get_data_dir() / "node_state.json"
 
+# Seconds between balance snapshots taken by a running node
+SNAPSHOT_INTERVAL = 600
+
 # Mining configuration
 MINING_REWARD_INITIAL = 50 * 100000000  # 50 coins in smallest unit
 MINING_REWARD_HALVING_INTERVAL = 210000  # Blocks
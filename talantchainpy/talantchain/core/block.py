@@ -1,8 +1,14 @@
-from dataclasses import dataclass
+import struct
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional, Dict
-from ..crypto.hash import Hash
-from .transaction import Transaction
+from ..crypto.hash import Hash, ZERO_HASH
+from .transaction import Transaction, transaction_hashes
+from .merkle import MerkleTree
+
+# Serialized header: version, prev hash, merkle root, timestamp, difficulty, nonce
+HEADER_STRUCT = struct.Struct('<I32s32sQII')
+U32 = struct.Struct('<I')
 
 @dataclass
 class BlockHeader:
@@ -13,25 +19,63 @@ class BlockHeader:
     difficulty: int
     nonce: int
 
+    # _serialized and _hash hold the serialized header and its hash, computed
+    # on first use and dropped whenever a field is assigned. Hash fields must
+    # be replaced, not mutated in place, for this to notice.
+    __slots__ = (
+        'version', 'prev_hash', 'merkle_root', 'timestamp', 'difficulty', 'nonce',
+        '_serialized', '_hash'
+    )
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in self.__dataclass_fields__:
+            object.__setattr__(self, '_serialized', None)
+            object.__setattr__(self, '_hash', None)
+
     def serialize(self) -> bytes:
         """Serialize the block header"""
-        return (
-            self.version.to_bytes(4, 'little') +
-            bytes(self.prev_hash) +
-            bytes(self.merkle_root) +
-            self.timestamp.to_bytes(8, 'little') +
-            self.difficulty.to_bytes(4, 'little') +
-            self.nonce.to_bytes(4, 'little')
+        if self._serialized is None:
+            object.__setattr__(self, '_serialized', HEADER_STRUCT.pack(
+                self.version,
+                bytes(self.prev_hash),
+                bytes(self.merkle_root),
+                self.timestamp,
+                self.difficulty,
+                self.nonce
+            ))
+        return self._serialized
+
+    @classmethod
+    def deserialize(cls, buf: bytes, offset: int = 0) -> 'BlockHeader':
+        """Deserialize a block header"""
+        version, prev_hash, merkle_root, timestamp, difficulty, nonce = \
+            HEADER_STRUCT.unpack_from(buf, offset)
+        return cls(
+            version=version,
+            prev_hash=Hash.from_bytes(prev_hash),
+            merkle_root=Hash.from_bytes(merkle_root),
+            timestamp=timestamp,
+            difficulty=difficulty,
+            nonce=nonce
         )
 
+    @property
+    def hash(self) -> Hash:
+        """Get header hash, hashing only after a field changed"""
+        if self._hash is None:
+            object.__setattr__(self, '_hash', Hash(self.serialize()))
+        return self._hash
+
 @dataclass
 class Block:
     header: BlockHeader
     transactions: List[Transaction]
+    _merkle: Optional[MerkleTree] = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def hash(self) -> Hash:
-        return self.calculate_hash()
+        return self.header.hash
 
     @property
     def timestamp(self) -> int:
@@ -40,28 +84,47 @@ class Block:
 
     def calculate_hash(self) -> Hash:
         """Calculate block hash"""
-        return Hash(self.header.serialize())
+        return self.header.hash
 
     def calculate_merkle_root(self) -> Hash:
         """Calculate merkle root of transactions"""
-        if not self.transactions:
-            return Hash()
-        
-        hashes = [tx.hash for tx in self.transactions]
-        while len(hashes) > 1:
-            if len(hashes) % 2 == 1:
-                hashes.append(hashes[-1])
-            hashes = [Hash(bytes(h1) + bytes(h2)) 
-                     for h1, h2 in zip(hashes[::2], hashes[1::2])]
-        return hashes[0]
-    
+        return Hash.from_bytes(self.merkle_tree.root)
+
+    @property
+    def merkle_tree(self) -> MerkleTree:
+        """Get Merkle tree of transactions, updating the cached one.
+
+        Transactions appended since the last call are added incrementally;
+        any other change to the list rebuilds the tree.
+        """
+        leaves = transaction_hashes(self.transactions)
+        tree = self._merkle
+        if tree is not None and len(tree) <= len(leaves):
+            if tree.levels[0] == b''.join(leaves[:len(tree)]):
+                tree.extend(leaves[len(tree):])
+                return tree
+        self._merkle = MerkleTree(leaves)
+        return self._merkle
+
+    def merkle_proof(self, tx_hash: str) -> Dict:
+        """Get inclusion proof of transaction for light clients"""
+        tree = self.merkle_tree
+        for index, tx in enumerate(self.transactions):
+            if tx.hash == tx_hash:
+                return {
+                    'index': index,
+                    'siblings': [sibling.hex() for sibling in tree.proof(index)],
+                    'merkle_root': self.header.merkle_root.hex()
+                }
+        raise ValueError("Transaction not in block")
+
     @classmethod
     def create_genesis_block(cls) -> 'Block':
         """Create the genesis block"""
         header = BlockHeader(
             version=1,
-            prev_hash=Hash(),  # Zero hash for genesis block
-            merkle_root=Hash(),
+            prev_hash=ZERO_HASH,  # Zero hash for genesis block
+            merkle_root=ZERO_HASH,
             timestamp=int(datetime.now().timestamp()),
             difficulty=1,
             nonce=0
@@ -89,6 +152,32 @@ class Block:
             
         return block
     
+    def to_bytes(self) -> bytes:
+        """Serialize header and transactions"""
+        parts = [self.header.serialize(), U32.pack(len(self.transactions))]
+        for tx in self.transactions:
+            data = tx.to_bytes()
+            parts.append(U32.pack(len(data)))
+            parts.append(data)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, buf: bytes) -> 'Block':
+        """Deserialize block written by to_bytes"""
+        view = memoryview(buf)
+        header = BlockHeader.deserialize(view)
+        offset = HEADER_STRUCT.size
+        (count,) = U32.unpack_from(view, offset)
+        offset += U32.size
+
+        transactions = []
+        for _ in range(count):
+            (length,) = U32.unpack_from(view, offset)
+            offset += U32.size
+            transactions.append(Transaction.from_bytes(view[offset:offset + length]))
+            offset += length
+        return cls(header=header, transactions=transactions)
+
     def to_dict(self) -> Dict:
         """Convert block to dictionary"""
         return {
@@ -116,8 +205,7 @@ class Block:
             return False
         
         # Verify proof of work
-        target = 2 ** (256 - self.header.difficulty)
-        if int.from_bytes(bytes(self.hash), 'big') >= target:
+        if not self.meets_difficulty(self.header.difficulty):
             return False
         
         # Verify transactions
@@ -1,111 +1,193 @@
-from typing import List, Optional, Dict
-from .block import Block
-from .transaction import Transaction
-from ..crypto.hash import Hash
+from typing import List, NamedTuple, Optional
+from .block import Block, BlockHeader
+from .chainview import ChainView
+from .rwlock import RWLock
+from .validation import BlockValidator
+from .transaction import Transaction, TxInput
+from ..config import get_data_dir
+from ..crypto.hash import Hash, ZERO_HASH
+from ..database.block_store import BlockStore
+from ..database.utxo_store import UTXOSet, outpoint
+from functools import partial
 import threading
 
+class ChainTip(NamedTuple):
+    """Immutable snapshot of the chain tip"""
+    height: int
+    hash: Hash
+    header: BlockHeader
+
 class Blockchain:
-    def __init__(self):
-        self.chain: List[Block] = []
+    def __init__(self, store_path: Optional[str] = None,
+                 cache_bytes: int = 32 * 1024 * 1024, workers: Optional[int] = None):
+        # Headers stay in memory, bodies are loaded from the store on demand
+        store_path = store_path or str(get_data_dir() / "chain.db")
+        self.chain = ChainView(BlockStore(store_path), cache_bytes)
         self.current_transactions: List[Transaction] = []
-        self.utxo_set: Dict[str, List[int]] = {}  # UTXO set for quick lookups
-        self.lock = threading.Lock()
+        self.utxo_set = UTXOSet(store_path)  # Keyed by 36-byte outpoint
+        # Readers (mempool admission, UTXO lookups) share the lock, block
+        # application takes it exclusively
+        self.lock = RWLock()
+        self._mempool_lock = threading.Lock()
+        self.validator = BlockValidator(workers)
         
         # Create genesis block
-        genesis = Block.create_genesis_block()
-        self.chain.append(genesis)
+        if not self.chain:
+            self._append(Block.create_genesis_block())
+        elif self.utxo_set.height != len(self.chain) - 1:
+            # Stored before block and UTXO writes shared a transaction
+            self._rebuild_utxo_set()
+        self._set_tip()
+    
+    @property
+    def tip(self) -> ChainTip:
+        """Get current tip snapshot; never blocks"""
+        return self._tip
     
     @property
     def last_block(self) -> Block:
-        return self.chain[-1]
+        return self.chain[self._tip.height]
+    
+    def get_blocks(self, start_height: int, end_height: Optional[int] = None) -> List[Block]:
+        """Get blocks in [start_height, end_height) up to the current tip"""
+        tip_end = self._tip.height + 1
+        end_height = tip_end if end_height is None else min(end_height, tip_end)
+        return self.chain[start_height:end_height]
+    
+    def _set_tip(self):
+        """Publish a new tip snapshot after the chain changed"""
+        header = self.chain.header(-1)
+        self._tip = ChainTip(len(self.chain) - 1, header.hash, header)
     
     def add_block(self, block: Block) -> bool:
         """Add a new block to the chain"""
-        with self.lock:
-            # Verify block
+        # Proof of work, Merkle root and signatures need no chain state, so
+        # they are checked in parallel without holding the lock
+        if not self.validator.validate(block):
+            return False
+        
+        with self.lock.write():
+            # Verify block against chain state
             if not self._verify_block(block):
                 return False
             
             # Add block to chain
-            self.chain.append(block)
-            
-            # Update UTXO set
-            self._update_utxo_set(block)
+            self._append(block)
+            self._set_tip()
             
             return True
     
+    def _append(self, block: Block):
+        """Store block with its UTXO and key image changes in one transaction"""
+        height = len(self.chain)
+        try:
+            self._update_utxo_set(block, height)
+            self.chain.append(block, partial(self.utxo_set.write_pending, height=height))
+        except Exception:
+            self.utxo_set.discard_pending()
+            raise
+        self.utxo_set.mark_written()
+    
+    def _rebuild_utxo_set(self, batch: int = 1000):
+        """Replay every stored block into an empty UTXO set"""
+        self.utxo_set.reset()
+        for height, block in enumerate(self.chain):
+            self._update_utxo_set(block, height)
+            if height % batch == batch - 1:
+                self.utxo_set.flush(height)
+        self.utxo_set.flush(len(self.chain) - 1)
+    
     def add_transaction(self, transaction: Transaction) -> bool:
         """Add a new transaction to the pool"""
-        if not self._verify_transaction(transaction):
-            return False
+        # Any number of admissions can check against the same UTXO state;
+        # only a block being applied holds them off
+        with self.lock.read():
+            if not self._verify_transaction(transaction):
+                return False
             
-        with self.lock:
+        with self._mempool_lock:
             self.current_transactions.append(transaction)
             return True
     
     def _verify_block(self, block: Block) -> bool:
-        """Verify block validity"""
+        """Verify block against chain state, after BlockValidator checks"""
         # Check previous hash
-        if block.header.prev_hash != self.last_block.hash:
+        if block.header.prev_hash != self._tip.hash:
             return False
         
-        # Check block hash meets difficulty
-        if not self._check_proof_of_work(block):
+        # Check all inputs are unspent
+        if not all(self._inputs_unspent(tx) for tx in block.transactions):
             return False
         
-        # Verify merkle root
-        if block.header.merkle_root != block.calculate_merkle_root():
+        # Check no key image is spent twice, in the chain or in this block
+        images = [image for tx in block.transactions for image in self._key_images(tx)]
+        if len(set(images)) != len(images):
             return False
-        
-        # Verify all transactions
-        for tx in block.transactions:
-            if not self._verify_transaction(tx):
-                return False
-        
-        return True
+        return not any(self.utxo_set.is_key_image_spent(image) for image in images)
     
     def _verify_transaction(self, transaction: Transaction) -> bool:
         """Verify transaction validity"""
+        # Reject double spends of ring inputs
+        if any(self.utxo_set.is_key_image_spent(image) for image in self._key_images(transaction)):
+            return False
+        
+        inputs = self._inputs(transaction)
+        if not inputs:
+            # Account transaction, the signature is all there is to check
+            return self.validator.verify_many([transaction])[0]
+        
         # Skip verification for coinbase transactions
-        if len(transaction.inputs) == 1 and transaction.inputs[0].prev_tx == Hash():
+        if len(inputs) == 1 and inputs[0].prev_tx == ZERO_HASH:
             return True
         
         # Check that inputs exist and are unspent
-        for tx_input in transaction.inputs:
-            utxo_key = f"{tx_input.prev_tx}:{tx_input.index}"
-            if utxo_key not in self.utxo_set:
-                return False
+        if not self._inputs_unspent(transaction):
+            return False
         
         # Verify signatures
-        for i, tx_input in enumerate(transaction.inputs):
+        for i, tx_input in enumerate(inputs):
             if not transaction.verify_signature(i, self._get_output_public_key(tx_input)):
                 return False
         
         return True
     
-    def _update_utxo_set(self, block: Block) -> None:
+    def _inputs_unspent(self, transaction: Transaction) -> bool:
+        """Check every input of transaction refers to an unspent output"""
+        return all(self._input_key(tx_input) in self.utxo_set
+                   for tx_input in self._inputs(transaction))
+    
+    def _update_utxo_set(self, block: Block, height: int) -> None:
         """Update UTXO set with new block"""
         # Remove spent outputs
         for tx in block.transactions:
-            for tx_input in tx.inputs:
-                utxo_key = f"{tx_input.prev_tx}:{tx_input.index}"
-                if utxo_key in self.utxo_set:
-                    del self.utxo_set[utxo_key]
+            for tx_input in self._inputs(tx):
+                self.utxo_set.spend(self._input_key(tx_input))
+            for image in self._key_images(tx):
+                self.utxo_set.spend_key_image(image, height)
         
         # Add new outputs
         for tx in block.transactions:
-            tx_hash = tx.hash
-            for i, output in enumerate(tx.outputs):
-                utxo_key = f"{tx_hash}:{i}"
-                self.utxo_set[utxo_key] = output.public_key
-    
-    def _check_proof_of_work(self, block: Block) -> bool:
-        """Check if block meets proof of work requirement"""
-        block_hash = block.hash
-        target = 2 ** (256 - block.header.difficulty)
-        return int.from_bytes(bytes(block_hash), 'big') < target
+            tx_hash = tx.hash_bytes
+            for i, output in enumerate(getattr(tx, 'outputs', ())):
+                self.utxo_set.add(outpoint(tx_hash, i), output.public_key)
     
-    def _get_output_public_key(self, tx_input: 'TxInput') -> bytes:
+    def _get_output_public_key(self, tx_input: TxInput) -> bytes:
         """Get public key from referenced output"""
-        utxo_key = f"{tx_input.prev_tx}:{tx_input.index}"
-        return self.utxo_set.get(utxo_key, b'')
+        return self.utxo_set.get(self._input_key(tx_input)) or b''
+
+    @staticmethod
+    def _inputs(transaction: Transaction) -> List[TxInput]:
+        """Get UTXO inputs, none for account-model transactions"""
+        return getattr(transaction, 'inputs', [])
+
+    @staticmethod
+    def _key_images(transaction: Transaction) -> List[bytes]:
+        """Get key images spent by transaction, ignoring coinbase ones"""
+        images = [tx_input.key_image for tx_input in Blockchain._inputs(transaction)]
+        images.append(transaction.key_image)
+        return [image for image in images if image and image != bytes(ZERO_HASH)]
+
+    @staticmethod
+    def _input_key(tx_input: TxInput) -> bytes:
+        """Get outpoint key of the output spent by tx_input"""
+        return outpoint(bytes(tx_input.prev_tx), tx_input.index)
@@ -0,0 +1,77 @@
+"""Bloom filter for TalantChain"""
+
+import hashlib
+import math
+from typing import Iterable
+
+class BloomFilter:
+    """Fixed-size Bloom filter over byte strings.
+
+    Sized for capacity items at false positive rate error. Bit positions
+    come from double hashing two 64-bit halves of one blake2b digest.
+    """
+
+    def __init__(self, capacity: int, error: float = 0.001):
+        self.capacity = max(capacity, 1)
+        self.error = error
+        self.size = max(8, int(-self.capacity * math.log(error) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: bytes):
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: bytes):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: bytes) -> bool:
+        """False means definitely absent, True means possibly present"""
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+class KeyImageIndex:
+    """Bloom filter over spent key images.
+
+    Most key images checked are unspent, and the filter rules those out
+    without touching the database; only possible reuses are looked up. Once
+    more images are added than it was sized for, the owner reloads it with
+    load(), which sizes it at twice the stored count.
+    """
+
+    def __init__(self, capacity: int = 1000000):
+        self.images = BloomFilter(capacity)
+
+    @classmethod
+    def load(cls, count: int, images: Iterable[bytes],
+             capacity: int = 1000000) -> 'KeyImageIndex':
+        """Build filter from the count stored images and the images themselves"""
+        index = cls(max(capacity, count * 2))
+        index.update(images)
+        return index
+
+    @property
+    def capacity(self) -> int:
+        return self.images.capacity
+
+    def __contains__(self, image: bytes) -> bool:
+        """False means unspent, True means possibly spent"""
+        return image in self.images
+
+    @property
+    def full(self) -> bool:
+        """Whether the filter outgrew its capacity and should be reloaded"""
+        return self.images.count > self.images.capacity
+
+    def add(self, image: bytes):
+        self.images.add(image)
+
+    def update(self, images: Iterable[bytes]):
+        """Add key images spent by a newly applied block"""
+        for image in images:
+            self.images.add(image)
@@ -0,0 +1,97 @@
+"""Header-only chain view with lazily loaded block bodies"""
+
+import threading
+from collections import OrderedDict
+from typing import Iterator, List, Union
+from .block import Block, BlockHeader
+
+class ChainView:
+    """Sequence of blocks keeping only headers in memory.
+
+    Full blocks are loaded from a BlockStore on access and kept in an LRU
+    cache bounded by their encoded size, so memory stays flat however long
+    the chain grows. Supports len(), indexing, slicing and iteration like
+    the list it replaces.
+    """
+
+    def __init__(self, store, cache_bytes: int = 32 * 1024 * 1024):
+        self.store = store
+        self.cache_bytes = cache_bytes
+        self.headers: List[BlockHeader] = [
+            BlockHeader.deserialize(header) for _, header in store.headers()
+        ]
+        self._cache: "OrderedDict[int, Block]" = OrderedDict()
+        self._sizes = {}
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.headers)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Block, List[Block]]:
+        if isinstance(index, slice):
+            return self._load_many(range(*index.indices(len(self.headers))))
+        if index < 0:
+            index += len(self.headers)
+        if not 0 <= index < len(self.headers):
+            raise IndexError("Block index out of range")
+        return self._load_many([index])[0]
+
+    def __iter__(self) -> Iterator[Block]:
+        # Load in chunks rather than one query per block
+        for start in range(0, len(self.headers), 256):
+            yield from self[start:start + 256]
+
+    def header(self, index: int) -> BlockHeader:
+        """Get header without loading the block body"""
+        return self.headers[index]
+
+    def append(self, block: Block, write=None):
+        """Store block and make it the new tip.
+
+        write is passed to the store to run in the same transaction.
+        """
+        body = block.to_bytes()
+        self.store.put(len(self.headers), block.header.serialize(), body, write)
+        self.headers.append(block.header)
+        with self._lock:
+            self._remember(len(self.headers) - 1, block, len(body))
+
+    def _load_many(self, indices) -> List[Block]:
+        """Get blocks at indices, fetching all cache misses in one query"""
+        with self._lock:
+            found = {}
+            for i in indices:
+                block = self._cache.get(i)
+                if block is not None:
+                    self._cache.move_to_end(i)
+                    found[i] = block
+            self.hits += len(found)
+        missing = [i for i in indices if i not in found]
+
+        if missing:
+            bodies = self.store.get_many(missing)
+            with self._lock:
+                self.misses += len(missing)
+                for i in missing:
+                    body = bodies[i]
+                    block = Block.from_bytes(body)
+                    # Share the header already in memory, with its cached hash
+                    block.header = self.headers[i]
+                    self._remember(i, block, len(body))
+                    found[i] = block
+
+        return [found[i] for i in indices]
+
+    def _remember(self, index: int, block: Block, size: int):
+        """Add block to the LRU cache, evicting the oldest past the byte cap"""
+        if index in self._cache:
+            return
+        self._cache[index] = block
+        self._sizes[index] = size
+        self._cached_bytes += size
+        while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+            evicted, _ = self._cache.popitem(last=False)
+            self._cached_bytes -= self._sizes.pop(evicted)
@@ -0,0 +1,104 @@
+"""Merkle tree implementation for TalantChain"""
+
+import hashlib
+from typing import Iterable, List
+
+HASH_SIZE = 32
+
+def _hash_pair(level: bytearray, index: int) -> bytes:
+    """Hash node index's pair on level, duplicating a missing right node"""
+    start = (index & ~1) * HASH_SIZE
+    view = memoryview(level)
+    if start + HASH_SIZE < len(level):
+        return hashlib.sha3_256(view[start:start + 2 * HASH_SIZE]).digest()
+    last = view[start:start + HASH_SIZE]
+    return hashlib.sha3_256(bytes(last) * 2).digest()
+
+class MerkleTree:
+    """Binary SHA3-256 Merkle tree over 32-byte transaction hashes.
+
+    Each level is one flat bytearray of node hashes. An odd node at the end of
+    a level is paired with itself. Appending a leaf only rehashes the path from
+    that leaf to the root, so a block template can grow one tx at a time.
+    """
+
+    def __init__(self, leaves: Iterable[bytes] = ()):
+        self.levels: List[bytearray] = [bytearray(b''.join(leaves))]
+        if len(self.levels[0]) % HASH_SIZE:
+            raise ValueError("Leaves must be 32-byte hashes")
+        self._build()
+
+    def _build(self):
+        """Hash every level from the leaves up"""
+        level = self.levels[0]
+        del self.levels[1:]
+        while len(level) > HASH_SIZE:
+            count = len(level) // HASH_SIZE
+            parent = bytearray(((count + 1) // 2) * HASH_SIZE)
+            for i in range(0, count, 2):
+                offset = (i // 2) * HASH_SIZE
+                parent[offset:offset + HASH_SIZE] = _hash_pair(level, i)
+            self.levels.append(parent)
+            level = parent
+
+    def __len__(self) -> int:
+        return len(self.levels[0]) // HASH_SIZE
+
+    def leaf(self, index: int) -> bytes:
+        """Get leaf hash at index"""
+        return bytes(self.levels[0][index * HASH_SIZE:(index + 1) * HASH_SIZE])
+
+    @property
+    def root(self) -> bytes:
+        """Get root hash, all zeros for an empty tree"""
+        if not self.levels[0]:
+            return bytes(HASH_SIZE)
+        return bytes(self.levels[-1][:HASH_SIZE])
+
+    def append(self, leaf: bytes):
+        """Add a leaf, rehashing only its path to the root"""
+        if len(leaf) != HASH_SIZE:
+            raise ValueError("Leaves must be 32-byte hashes")
+        self.levels[0] += leaf
+
+        depth = 0
+        index = len(self) - 1
+        while len(self.levels[depth]) > HASH_SIZE:
+            if depth + 1 == len(self.levels):
+                self.levels.append(bytearray())
+            parent = self.levels[depth + 1]
+            digest = _hash_pair(self.levels[depth], index)
+            index //= 2
+            offset = index * HASH_SIZE
+            # The changed parent is always the last node of its level
+            parent[offset:offset + HASH_SIZE] = digest
+            depth += 1
+
+    def extend(self, leaves: Iterable[bytes]):
+        """Add several leaves"""
+        for leaf in leaves:
+            self.append(leaf)
+
+    def proof(self, index: int) -> List[bytes]:
+        """Get sibling hashes from leaf index up to the root"""
+        if not 0 <= index < len(self):
+            raise IndexError("Leaf index out of range")
+        siblings = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling * HASH_SIZE >= len(level):
+                sibling = index  # Odd node paired with itself
+            siblings.append(bytes(level[sibling * HASH_SIZE:(sibling + 1) * HASH_SIZE]))
+            index //= 2
+        return siblings
+
+def verify_proof(leaf: bytes, index: int, proof: List[bytes], root: bytes) -> bool:
+    """Check that leaf sits at index of the tree with the given root"""
+    node = leaf
+    for sibling in proof:
+        if index & 1:
+            node = hashlib.sha3_256(sibling + node).digest()
+        else:
+            node = hashlib.sha3_256(node + sibling).digest()
+        index //= 2
+    return index == 0 and node == root
@@ -1,30 +1,205 @@
 """Transaction implementation for TalantChain"""
 
+import struct
+import sys
 import time
-import json
 from decimal import Decimal
-from typing import Dict, Optional
-from ..crypto.hash import Hash
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+from ..crypto.hash import Hash, hash_many
 from ..crypto.keys import PrivateKey, PublicKey
+from ..crypto.sigcache import signature_cache
+from ..crypto.verifier import ADDRESS, Item
+from ..units import from_atomic, to_atomic
+
+# Canonical binary layout (little endian):
+#   fixed        version, amount, fee, timestamp (amounts in atomic units)
+#   strings      u16 length + utf-8 for sender, recipient, signature
+#                (empty signature means unsigned)
+#   key image    u16 length + 32 bytes, version 2 only
+# The hash covers the unsigned encoding.
+TX_FIXED = struct.Struct('<BQQQ')
+U16 = struct.Struct('<H')
+TX_VERSION = 1
+TX_VERSION_KEY_IMAGE = 2  # Ring-signed, carries a key image
+KEY_IMAGE_SIZE = 32
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+def pack_transaction(amount: int, fee: int, timestamp: int, sender: str, recipient: str,
+                     signature: str = '', key_image: bytes = b'') -> bytes:
+    """Encode transaction fields in the canonical binary layout"""
+    version = TX_VERSION_KEY_IMAGE if key_image else TX_VERSION
+    parts = [TX_FIXED.pack(version, amount, fee, timestamp)]
+    for field in (sender, recipient, signature):
+        data = field.encode()
+        parts.append(U16.pack(len(data)))
+        parts.append(data)
+    if key_image:
+        parts.append(U16.pack(len(key_image)))
+        parts.append(key_image)
+    return b''.join(parts)
+
+def unpack_transaction(buf: Buffer, offset: int = 0) -> Tuple[
+        int, int, int, str, str, str, Optional[bytes], int]:
+    """Decode canonical binary transaction at offset.
+
+    Returns amount, fee, timestamp, sender, recipient, signature, key image
+    (None for version 1) and the offset just past the record.
+    """
+    view = memoryview(buf)
+    version, amount, fee, timestamp = TX_FIXED.unpack_from(view, offset)
+    if version not in (TX_VERSION, TX_VERSION_KEY_IMAGE):
+        raise ValueError(f"Unsupported transaction version {version}")
+    offset += TX_FIXED.size
+
+    fields = []
+    for _ in range(3):
+        (length,) = U16.unpack_from(view, offset)
+        offset += U16.size
+        fields.append(str(view[offset:offset + length], 'utf-8'))
+        offset += length
+
+    key_image = None
+    if version == TX_VERSION_KEY_IMAGE:
+        (length,) = U16.unpack_from(view, offset)
+        offset += U16.size
+        key_image = bytes(view[offset:offset + length])
+        offset += length
+    return (amount, fee, timestamp, *fields, key_image, offset)
+
+def transaction_hashes(txs: List['Transaction']) -> List[bytes]:
+    """Get raw hashes of txs, hashing the ones not cached yet in one batch"""
+    missing = [tx for tx in txs if tx._hash_bytes is None]
+    hashes = hash_many(tx.to_bytes(include_signature=False) for tx in missing)
+    for tx, h in zip(missing, hashes):
+        tx._hash_bytes = bytes(h)
+    return [tx._hash_bytes for tx in txs]
+
+class TxInput(NamedTuple):
+    """Reference to a previous output being spent"""
+    prev_tx: Hash
+    index: int
+    signature: Optional[bytes] = None
+    key_image: Optional[bytes] = None  # Set on ring-signed inputs
+
+class TxOutput(NamedTuple):
+    """Amount locked to a public key"""
+    amount: int
+    public_key: bytes
+
+class Input(NamedTuple):
+    """Ring-signed input used by TransactionBuilder"""
+    amount: Decimal
+    key_image: bytes
+    ring_members: List[bytes]
+
+class Output(NamedTuple):
+    """Stealth output used by TransactionBuilder"""
+    amount: Decimal
+    recipient_spend_public: bytes
+    recipient_view_public: bytes
+
+class RingTransaction(NamedTuple):
+    """Ring-signed transaction built by TransactionBuilder.
+
+    data is the serialized transaction the input signatures cover; coinbase
+    transactions have no signatures.
+    """
+    timestamp: int
+    inputs: List[Input]
+    outputs: List[Output]
+    signatures: List[Tuple[List[bytes], bytes]]
+    fee: Decimal
+    data: bytes
+    is_coinbase: bool = False
 
 class Transaction:
+    __slots__ = (
+        'sender', 'recipient', 'amount', 'timestamp', 'signature', 'fee', 'key_image',
+        '_unsigned', '_signed', '_hash', '_hash_bytes'
+    )
+
+    # Fields covered by the cached encodings
+    _ENCODED_FIELDS = frozenset((
+        'sender', 'recipient', 'amount', 'timestamp', 'signature', 'fee', 'key_image'
+    ))
+
     def __init__(self, sender: str, recipient: str, amount: Decimal,
-                 timestamp: Optional[int] = None, signature: Optional[str] = None):
-        self.sender = sender
-        self.recipient = recipient
+                 timestamp: Optional[int] = None, signature: Optional[str] = None,
+                 fee: Decimal = Decimal('0'), key_image: Optional[bytes] = None):
+        if key_image is not None and len(key_image) != KEY_IMAGE_SIZE:
+            raise ValueError(f"Key image must be {KEY_IMAGE_SIZE} bytes")
+        # Addresses repeat across many transactions, share one copy of each
+        self.sender = sys.intern(sender)
+        self.recipient = sys.intern(recipient)
         self.amount = amount
         self.timestamp = timestamp or int(time.time())
         self.signature = signature
-        self._hash = None
+        self.fee = fee
+        self.key_image = key_image  # Spent once; set on ring-signed transactions
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in self._ENCODED_FIELDS:
+            # The signature is not hashed, so only drop the signed bytes
+            if name != 'signature':
+                object.__setattr__(self, '_unsigned', None)
+                object.__setattr__(self, '_hash_bytes', None)
+                object.__setattr__(self, '_hash', None)
+            object.__setattr__(self, '_signed', None)
 
     @property
     def hash(self) -> str:
         """Get transaction hash"""
-        if not self._hash:
-            data = self.to_dict(include_signature=False)
-            self._hash = Hash(json.dumps(data, sort_keys=True)).hex()
+        if self._hash is None:
+            self._hash = self.hash_bytes.hex()
         return self._hash
 
+    @property
+    def hash_bytes(self) -> bytes:
+        """Get raw 32-byte transaction hash"""
+        if self._hash_bytes is None:
+            self._hash_bytes = bytes(Hash(self.to_bytes(include_signature=False)))
+        return self._hash_bytes
+
+    def to_bytes(self, include_signature: bool = True) -> bytes:
+        """Encode transaction in the canonical binary layout"""
+        if not include_signature or not self.signature:
+            if self._unsigned is None:
+                self._unsigned = pack_transaction(
+                    to_atomic(self.amount), to_atomic(self.fee), self.timestamp,
+                    self.sender, self.recipient, '', self.key_image or b''
+                )
+            return self._unsigned
+        if self._signed is None:
+            self._signed = pack_transaction(
+                to_atomic(self.amount), to_atomic(self.fee), self.timestamp,
+                self.sender, self.recipient, self.signature, self.key_image or b''
+            )
+        return self._signed
+
+    @classmethod
+    def from_bytes(cls, buf: Buffer) -> 'Transaction':
+        """Decode transaction from the canonical binary layout"""
+        amount, fee, timestamp, sender, recipient, signature, key_image, end = \
+            unpack_transaction(buf)
+        if end != len(buf):
+            raise ValueError("Trailing data after transaction")
+        tx = cls(
+            sender=sender,
+            recipient=recipient,
+            amount=from_atomic(amount),
+            timestamp=timestamp,
+            signature=signature or None,
+            fee=from_atomic(fee),
+            key_image=key_image
+        )
+        if signature:
+            tx._signed = bytes(buf)
+        else:
+            tx._unsigned = bytes(buf)
+        return tx
+
     def sign(self, private_key: PrivateKey) -> None:
         """Sign transaction with private key"""
         if self.signature:
@@ -37,14 +212,26 @@ class Transaction:
         """Verify transaction signature"""
         if not self.signature:
             return False
+        
+        # Signatures checked at relay time are not checked again in blocks
+        if signature_cache.contains(self.hash_bytes, self.signature):
+            return True
             
         try:
             # Reconstruct public key from sender address
             public_key = PublicKey.from_address(self.sender)
             # Verify signature
-            return public_key.verify(self.hash, self.signature)
+            valid = public_key.verify(self.hash, self.signature)
         except Exception:
             return False
+        
+        if valid:
+            signature_cache.add(self.hash_bytes, self.signature)
+        return valid
+
+    def signature_item(self) -> Item:
+        """Get signature check for the verification service"""
+        return (ADDRESS, self.hash.encode(), (self.signature or '').encode(), self.sender.encode())
 
     def to_dict(self, include_signature: bool = True) -> Dict:
         """Convert transaction to dictionary"""
@@ -54,6 +241,10 @@ class Transaction:
             'amount': str(self.amount),
             'timestamp': self.timestamp
         }
+        if self.fee:
+            data['fee'] = str(self.fee)
+        if self.key_image:
+            data['key_image'] = self.key_image.hex()
         if include_signature and self.signature:
             data['signature'] = self.signature
             data['hash'] = self.hash
@@ -66,7 +257,9 @@ class Transaction:
             sender=data['sender'],
             recipient=data['recipient'],
             amount=Decimal(data['amount']),
-            timestamp=data['timestamp']
+            timestamp=data['timestamp'],
+            fee=Decimal(data.get('fee', '0')),
+            key_image=bytes.fromhex(data['key_image']) if data.get('key_image') else None
         )
         if 'signature' in data:
             tx.signature = data['signature']
@@ -1,13 +1,35 @@
 """Transaction builder for TalantChain"""
 
 from typing import List, Tuple, Optional
-from ..crypto.ring_signature import RingSignature
+from ..crypto.ring_signature import RingSignature, Signature
 from ..crypto.address import Address
-from .transaction import Transaction, Input, Output
+from ..crypto.hash import ZERO_HASH
+from .transaction import RingTransaction, Input, Output
+from ..units import to_atomic
+from concurrent.futures import ProcessPoolExecutor
+import os
 import struct
 import time
 from decimal import Decimal
 
+TIMESTAMP = struct.Struct("!Q")
+AMOUNT = struct.Struct("!Q")  # Atomic units
+COUNT = struct.Struct("!I")
+
+# Below this many inputs a batch is signed in the calling process
+MIN_PARALLEL_INPUTS = 16
+
+def _put(buf: bytearray, offset: int, data: bytes) -> int:
+    end = offset + len(data)
+    buf[offset:end] = data
+    return end
+
+def _sign_inputs(job: Tuple[bytes, List[List[bytes]], bytes]) -> List[Signature]:
+    """Sign inputs of one transaction given their rings"""
+    tx_data, rings, private_key = job
+    # Real input is always at index 0 in ring
+    return [RingSignature.sign(tx_data, ring, private_key, 0) for ring in rings]
+
 class TransactionBuilder:
     def __init__(self):
         self.inputs: List[Input] = []
@@ -36,8 +58,42 @@ class TransactionBuilder:
         )
         self.outputs.append(output_data)
         
-    def build(self, sender_private_key: bytes) -> Transaction:
-        """Build final transaction"""
+    def serialize(self, timestamp: int) -> bytes:
+        """Serialize transaction data covered by the input signatures"""
+        size = TIMESTAMP.size + 2 * COUNT.size
+        for input_data in self.inputs:
+            size += AMOUNT.size + len(input_data.key_image) + COUNT.size
+            size += sum(len(member) for member in input_data.ring_members)
+        for output_data in self.outputs:
+            size += AMOUNT.size + len(output_data.recipient_spend_public)
+            size += len(output_data.recipient_view_public)
+
+        # Write everything into one buffer sized up front
+        buf = bytearray(size)
+        TIMESTAMP.pack_into(buf, 0, timestamp)
+        offset = TIMESTAMP.size
+        
+        # Add inputs
+        COUNT.pack_into(buf, offset, len(self.inputs))
+        offset += COUNT.size
+        for input_data in self.inputs:
+            AMOUNT.pack_into(buf, offset, to_atomic(input_data.amount))
+            offset = _put(buf, offset + AMOUNT.size, input_data.key_image)
+            COUNT.pack_into(buf, offset, len(input_data.ring_members))
+            offset += COUNT.size
+            for member in input_data.ring_members:
+                offset = _put(buf, offset, member)
+                
+        # Add outputs
+        COUNT.pack_into(buf, offset, len(self.outputs))
+        offset += COUNT.size
+        for output_data in self.outputs:
+            AMOUNT.pack_into(buf, offset, to_atomic(output_data.amount))
+            offset = _put(buf, offset + AMOUNT.size, output_data.recipient_spend_public)
+            offset = _put(buf, offset, output_data.recipient_view_public)
+        return bytes(buf)
+
+    def _fee(self) -> Decimal:
         if not self.inputs or not self.outputs:
             raise ValueError("Transaction must have at least one input and output")
             
@@ -48,51 +104,80 @@ class TransactionBuilder:
         
         if fee < 0:
             raise ValueError("Insufficient input amount")
-            
-        # Create transaction data
-        tx_data = struct.pack(
-            "!Q",  # Timestamp
-            int(time.time())
-        )
+        return fee
         
-        # Add inputs
-        tx_data += struct.pack("!I", len(self.inputs))
-        for input_data in self.inputs:
-            tx_data += struct.pack("!Q", int(input_data.amount * 1e8))  # Convert to atomic units
-            tx_data += input_data.key_image
-            tx_data += struct.pack("!I", len(input_data.ring_members))
-            for member in input_data.ring_members:
-                tx_data += member
-                
-        # Add outputs
-        tx_data += struct.pack("!I", len(self.outputs))
-        for output_data in self.outputs:
-            tx_data += struct.pack("!Q", int(output_data.amount * 1e8))  # Convert to atomic units
-            tx_data += output_data.recipient_spend_public
-            tx_data += output_data.recipient_view_public
-            
-        # Sign transaction
-        signatures = []
-        for i, input_data in enumerate(self.inputs):
-            signature = RingSignature.sign(
-                tx_data,
-                input_data.ring_members,
-                sender_private_key,
-                0  # Real input is always at index 0 in ring
+    def sign(self, sender_private_key: bytes, timestamp: Optional[int] = None,
+             workers: Optional[int] = None) -> Tuple[bytes, List[Signature]]:
+        """Serialize the transaction and ring-sign every input.
+
+        Returns the signed data and one signature per input.
+        """
+        return TransactionBuilder.sign_many([self], sender_private_key, timestamp, workers)[0]
+
+    @staticmethod
+    def sign_many(builders: List['TransactionBuilder'], sender_private_key: bytes,
+                  timestamp: Optional[int] = None,
+                  workers: Optional[int] = None) -> List[Tuple[bytes, List[Signature]]]:
+        """Serialize and sign a batch of transactions, e.g. payouts.
+
+        Returns (signed data, signatures) per builder. Inputs of all builders
+        are signed on one process pool once there are MIN_PARALLEL_INPUTS of
+        them.
+        """
+        if timestamp is None:
+            timestamp = int(time.time())
+        for builder in builders:
+            builder._fee()  # Check inputs and outputs before signing
+        datas = [builder.serialize(timestamp) for builder in builders]
+        rings = [[input_data.ring_members for input_data in builder.inputs]
+                 for builder in builders]
+        total = sum(len(r) for r in rings)
+        workers = workers or os.cpu_count() or 1
+        if total < MIN_PARALLEL_INPUTS or workers == 1:
+            return [(tx_data, _sign_inputs((tx_data, r, sender_private_key)))
+                    for tx_data, r in zip(datas, rings)]
+
+        # Each job signs a run of inputs of one transaction, so tx_data is
+        # sent once per run
+        chunk = -(-total // (workers * 4))
+        jobs, owners = [], []
+        for n, (tx_data, r) in enumerate(zip(datas, rings)):
+            for i in range(0, len(r), chunk):
+                jobs.append((tx_data, r[i:i + chunk], sender_private_key))
+                owners.append(n)
+        signatures: List[List[Signature]] = [[] for _ in builders]
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            for n, result in zip(owners, executor.map(_sign_inputs, jobs)):
+                signatures[n].extend(result)
+        return list(zip(datas, signatures))
+
+    def build(self, sender_private_key: bytes, timestamp: Optional[int] = None,
+              workers: Optional[int] = None) -> RingTransaction:
+        """Build final transaction"""
+        return TransactionBuilder.build_many([self], sender_private_key, timestamp, workers)[0]
+
+    @staticmethod
+    def build_many(builders: List['TransactionBuilder'], sender_private_key: bytes,
+                   timestamp: Optional[int] = None,
+                   workers: Optional[int] = None) -> List[RingTransaction]:
+        """Build a batch of transactions, signing them together"""
+        if timestamp is None:
+            timestamp = int(time.time())
+        signed = TransactionBuilder.sign_many(builders, sender_private_key, timestamp, workers)
+        return [
+            RingTransaction(
+                timestamp=timestamp,
+                inputs=list(builder.inputs),
+                outputs=list(builder.outputs),
+                signatures=signatures,
+                fee=builder._fee(),
+                data=tx_data
             )
-            signatures.append(signature)
-            
-        # Create final transaction
-        return Transaction(
-            timestamp=int(time.time()),
-            inputs=self.inputs,
-            outputs=self.outputs,
-            signatures=signatures,
-            fee=fee
-        )
+            for builder, (tx_data, signatures) in zip(builders, signed)
+        ]
         
     @staticmethod
-    def create_coinbase(reward: Decimal, miner_address: str) -> Transaction:
+    def create_coinbase(reward: Decimal, miner_address: str) -> RingTransaction:
         """Create coinbase transaction for mining reward"""
         builder = TransactionBuilder()
         
@@ -102,13 +187,19 @@ class TransactionBuilder:
         # Create special coinbase input
         builder.add_input(
             amount=reward,
-            key_image=bytes(32),  # Empty key image for coinbase
+            key_image=bytes(ZERO_HASH),  # Empty key image for coinbase
             ring_members=[bytes(32)],  # Empty ring members
             private_key=bytes(32)  # Empty private key
         )
         
         # Build transaction without signatures (coinbase doesn't need them)
-        tx = builder.build(bytes(32))
-        tx.is_coinbase = True
-        
-        return tx
+        timestamp = int(time.time())
+        return RingTransaction(
+            timestamp=timestamp,
+            inputs=builder.inputs,
+            outputs=builder.outputs,
+            signatures=[],
+            fee=builder._fee(),
+            data=builder.serialize(timestamp),
+            is_coinbase=True
+        )
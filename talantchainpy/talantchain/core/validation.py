@@ -0,0 +1,53 @@
+"""Stateless block validation for TalantChain"""
+
+import asyncio
+from typing import List, Optional
+from .block import Block
+from .transaction import Transaction
+from ..crypto.sigcache import signature_cache
+from ..crypto.verifier import VerificationService, bit
+
+class BlockValidator:
+    """Runs the checks that need no chain state.
+
+    Proof of work, the Merkle root and transaction signatures depend only on
+    the block itself, so they are checked before the chain lock is taken.
+    Signatures not already in the signature cache are sent as one batch to
+    the verification service, which spreads them over its process pool.
+    """
+
+    def __init__(self, workers: Optional[int] = None,
+                 verifier: Optional[VerificationService] = None):
+        self.verifier = verifier or VerificationService(workers)
+
+    def validate(self, block: Block) -> bool:
+        """Check block and its transactions without touching chain state"""
+        if not block.meets_difficulty(block.header.difficulty):
+            return False
+        if block.header.merkle_root != block.calculate_merkle_root():
+            return False
+        return all(self.verify_many(block.transactions))
+
+    def verify_many(self, txs: List[Transaction]) -> List[bool]:
+        """Check signature of each transaction"""
+        # Skip signatures already verified, e.g. at mempool admission
+        results = [bool(tx.signature) and signature_cache.contains(tx.hash_bytes, tx.signature)
+                   for tx in txs]
+        unchecked = [i for i, ok in enumerate(results) if not ok and txs[i].signature]
+        if not unchecked:
+            return results
+
+        bitmap = self.verifier.verify([txs[i].signature_item() for i in unchecked])
+        for n, i in enumerate(unchecked):
+            if bit(bitmap, n):
+                results[i] = True
+                # Workers have their own cache, remember results here
+                signature_cache.add(txs[i].hash_bytes, txs[i].signature)
+        return results
+
+    async def verify_many_async(self, txs: List[Transaction]) -> List[bool]:
+        """Check signature of each transaction without blocking the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.verify_many, txs)
+
+    def close(self):
+        self.verifier.close()
@@ -1,21 +1,32 @@
-from typing import Union
-from cryptography.hazmat.primitives import hashes
+import hashlib
+from typing import Iterable, List, Union
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base58
 
+ZERO = bytes(32)  # Shared by every zero hash
+
 class Hash:
+    __slots__ = ('_bytes',)
+
     SIZE = 32  # 256 bits
 
     def __init__(self, data: Union[bytes, str, None] = None):
-        self._bytes = bytes(self.SIZE) if data is None else self._hash(data)
+        self._bytes = ZERO if data is None else self._hash(data)
 
     @staticmethod
     def _hash(data: Union[bytes, str]) -> bytes:
         if isinstance(data, str):
             data = data.encode()
-        digest = hashes.Hash(hashes.SHA3_256())
-        digest.update(data)
-        return digest.finalize()
+        return hashlib.sha3_256(data).digest()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Hash':
+        """Wrap an existing 32-byte digest without rehashing"""
+        if len(data) != cls.SIZE:
+            raise ValueError(f"Hash must be {cls.SIZE} bytes")
+        h = object.__new__(cls)
+        h._bytes = data if type(data) is bytes else bytes(data)
+        return h
 
     def __bytes__(self) -> bytes:
         return self._bytes
@@ -29,14 +40,14 @@ class Hash:
 
     @staticmethod
     def from_string(s: str) -> 'Hash':
-        h = Hash()
+        h = Hash.__new__(Hash)
         h._bytes = base58.b58decode(s)
         return h
         
     @staticmethod
     def from_hex(s: str) -> 'Hash':
         """Create Hash from hex string"""
-        h = Hash()
+        h = Hash.__new__(Hash)
         h._bytes = bytes.fromhex(s)
         return h
 
@@ -54,3 +65,18 @@ class Hash:
         h = Hash(data)
         # Note: In a real implementation, we would use the actual CryptoNight algorithm
         return h
+
+ZERO_HASH = Hash()
+
+def hash_many(items: Iterable[Union[bytes, str]]) -> List[Hash]:
+    """Hash each item, e.g. all transactions of a block"""
+    sha3 = hashlib.sha3_256
+    new = Hash.__new__
+    result = []
+    for data in items:
+        if isinstance(data, str):
+            data = data.encode()
+        h = new(Hash)
+        h._bytes = sha3(data).digest()
+        result.append(h)
+    return result
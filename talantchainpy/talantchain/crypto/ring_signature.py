@@ -3,10 +3,28 @@
 from nacl.bindings import crypto_scalarmult_base
 from nacl.signing import SigningKey, VerifyKey
 from nacl.hash import blake2b
+import hashlib
 import os
 from typing import List, Tuple
 from .hash import Hash
 
+Signature = Tuple[List[bytes], bytes]
+
+def _prefix(message: bytes, key_image: bytes):
+    """Get blake2b state primed with the hex hash of message and key image.
+
+    Every ring member hashes h + s_i; copying this state hashes h once per
+    signature instead of once per member. Digests are hex encoded, as
+    nacl.hash.blake2b returns them.
+    """
+    h = hashlib.blake2b(message + key_image, digest_size=32).hexdigest().encode()
+    return hashlib.blake2b(h, digest_size=32)
+
+def _member_digest(prefix, s: bytes) -> bytes:
+    state = prefix.copy()
+    state.update(s)
+    return state.hexdigest().encode()
+
 class RingSignature:
     @staticmethod
     def generate_key_pair() -> Tuple[bytes, bytes]:
@@ -23,7 +41,7 @@ class RingSignature:
         
     @staticmethod
     def sign(message: bytes, public_keys: List[bytes], private_key: bytes, 
-            key_index: int) -> Tuple[List[bytes], bytes]:
+            key_index: int) -> Signature:
         """Create ring signature"""
         n = len(public_keys)
         if key_index >= n:
@@ -35,41 +53,53 @@ class RingSignature:
         
         # Calculate key image
         key_image = RingSignature.generate_key_image(private_key, public_keys[key_index])
+        prefix = _prefix(message, key_image)
         
-        # Generate c values
-        c = [bytes(32) for _ in range(n)]
-        h = blake2b(message + key_image, digest_size=32)
-        
-        # Calculate signature
+        # One pass: hash each member's random value to get the next member's
+        # c, and mask the member with its own c (zero for the one after the
+        # signer). XOR is done on ints rather than byte by byte.
+        prev = None
         for i in range(n):
-            if i == key_index:
-                continue
-            c[(i + 1) % n] = blake2b(h + s[i], digest_size=32)
-            
-        # Calculate final signature
+            c = prev
+            prev = _member_digest(prefix, s[i]) if i != key_index else None
+            if i and c is not None:
+                s[i] = _xor(s[i], c)
+                
+        # c for member 0 comes from the last member, once member 0 is hashed
+        if key_index != 0 and prev is not None:
+            s[0] = _xor(s[0], prev)
         s[key_index] = alpha
-        for i in range(n):
-            if i != key_index:
-                s[i] = bytes(x ^ y for x, y in zip(s[i], c[i]))
                 
         return s, key_image
         
     @staticmethod
-    def verify(message: bytes, public_keys: List[bytes], signature: Tuple[List[bytes], bytes]) -> bool:
+    def verify(message: bytes, public_keys: List[bytes], signature: Signature) -> bool:
         """Verify ring signature"""
         s_values, key_image = signature
         n = len(public_keys)
         
         if len(s_values) != n:
             return False
+        if not n:
+            return True
             
-        # Verify key image
-        h = blake2b(message + key_image, digest_size=32)
-        
-        # Calculate and verify c values
-        c = [bytes(32) for _ in range(n)]
-        for i in range(n):
-            c[(i + 1) % n] = blake2b(h + s_values[i], digest_size=32)
-            
-        # Final verification
-        return all(c[i] == blake2b(h + s_values[i], digest_size=32) for i in range(n))
+        # Member i's c is the digest of member i - 1 (cyclically) and must
+        # equal member i's own digest; each digest is computed once
+        prefix = _prefix(message, key_image)
+        prev = _member_digest(prefix, s_values[-1])
+        for s in s_values:
+            digest = _member_digest(prefix, s)
+            if digest != prev:
+                return False
+            prev = digest
+        return True
+
+    @staticmethod
+    def verify_batch(items: List[Tuple[bytes, List[bytes], Signature]]) -> List[bool]:
+        """Verify many (message, public keys, signature) ring signatures"""
+        return [RingSignature.verify(message, public_keys, signature)
+                for message, public_keys, signature in items]
+
+def _xor(value: bytes, c: bytes) -> bytes:
+    """XOR 32-byte value with the first 32 bytes of c"""
+    return (int.from_bytes(value, 'little') ^ int.from_bytes(c[:32], 'little')).to_bytes(32, 'little')
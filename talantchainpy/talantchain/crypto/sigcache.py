@@ -0,0 +1,65 @@
+"""Verified signature cache for TalantChain"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+class SignatureCache:
+    """Bounded LRU set of (tx hash, signature) pairs already verified.
+
+    Entries are keyed by a digest of both, so a tx seen again with a
+    different signature is checked again. Only successful checks are
+    stored.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(tx_hash: bytes, signature: str) -> bytes:
+        return hashlib.sha256(tx_hash + signature.encode()).digest()
+
+    def contains(self, tx_hash: bytes, signature: str) -> bool:
+        """Check whether signature over tx_hash was already verified"""
+        key = self._key(tx_hash, signature)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def add(self, tx_hash: bytes, signature: str):
+        """Record a verified signature"""
+        key = self._key(tx_hash, signature)
+        with self._lock:
+            self._entries[key] = None
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Get size and hit-rate metrics"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+# Shared by mempool admission and block validation
+signature_cache = SignatureCache()
@@ -0,0 +1,131 @@
+"""Parallel signature verification for TalantChain"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from nacl.signing import VerifyKey
+from .keys import PublicKey
+
+# Signature schemes. Every field of an item is bytes:
+#   ECDSA    DER public key, utf-8 message, base58 signature (PublicKey)
+#   ED25519  raw 32-byte key, message, raw signature (KeyPair)
+#   ADDRESS  utf-8 address the key is recovered from, as Transaction.verify
+ECDSA = 0
+ED25519 = 1
+ADDRESS = 2
+
+# (scheme, message, signature, key)
+Item = Tuple[int, bytes, bytes, bytes]
+
+# Below this many items a batch is checked in the calling thread
+MIN_PARALLEL_ITEMS = 16
+
+class VerifierBusy(RuntimeError):
+    """Raised when the verification queue stays full past the timeout"""
+
+def _verify_item(item: Item) -> bool:
+    scheme, message, signature, key = item
+    try:
+        if scheme == ECDSA:
+            public_key = PublicKey.from_bytes(key)
+        elif scheme == ADDRESS:
+            public_key = PublicKey.from_address(key.decode())
+        elif scheme == ED25519:
+            VerifyKey(key).verify(message, signature)
+            return True
+        else:
+            return False
+        return public_key.verify(message.decode(), signature.decode())
+    except Exception:
+        return False
+
+def verify_items(items: List[Item]) -> bytes:
+    """Verify items, returning a bitmap with bit i set if item i is valid"""
+    bitmap = bytearray((len(items) + 7) // 8)
+    for i, item in enumerate(items):
+        if _verify_item(item):
+            bitmap[i >> 3] |= 1 << (i & 7)
+    return bytes(bitmap)
+
+def bit(bitmap: bytes, index: int) -> bool:
+    """Check whether item index passed"""
+    return bool(bitmap[index >> 3] & (1 << (index & 7)))
+
+def all_valid(bitmap: bytes, count: int) -> bool:
+    """Check whether all of count items passed"""
+    return all(bit(bitmap, i) for i in range(count))
+
+class VerificationService:
+    """Verifies batches of signatures on a process pool.
+
+    A batch is split into one chunk per worker and the chunk bitmaps are
+    joined back together. At most max_pending items may be in flight;
+    further callers wait for room and get VerifierBusy after timeout
+    seconds, so a flood of requests queues at the edge instead of piling up
+    in the pool.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: int = 65536,
+                 timeout: Optional[float] = 30.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cond = threading.Condition()
+        self._pending = 0
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    @property
+    def pending(self) -> int:
+        """Items currently queued or being verified"""
+        return self._pending
+
+    def verify(self, items: List[Item]) -> bytes:
+        """Verify a batch, returning its bitmap"""
+        # Small batches run inline but still count against max_pending, so
+        # single transactions get the same backpressure as large batches
+        self._reserve(len(items))
+        try:
+            if len(items) < MIN_PARALLEL_ITEMS or self.workers == 1:
+                return verify_items(items)
+
+            # Chunks are whole bytes of the bitmap so they can be concatenated
+            chunk = -(-len(items) // self.workers)
+            chunk = -(-chunk // 8) * 8
+            futures = [self.pool.submit(verify_items, items[i:i + chunk])
+                       for i in range(0, len(items), chunk)]
+            return b''.join(future.result() for future in futures)
+        finally:
+            self._release(len(items))
+
+    async def verify_async(self, items: List[Item]) -> bytes:
+        """Verify a batch without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.verify, items)
+
+    def _reserve(self, count: int):
+        with self._cond:
+            # A batch larger than the cap still runs once the queue is empty
+            if not self._cond.wait_for(
+                lambda: self._pending == 0 or self._pending + count <= self.max_pending,
+                self.timeout
+            ):
+                raise VerifierBusy("Signature verification queue is full")
+            self._pending += count
+
+    def _release(self, count: int):
+        with self._cond:
+            self._pending -= count
+            self._cond.notify_all()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,190 @@
+"""Async facade over the TalantChain database"""
+
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .db import Database
+
+# (cursor-level write, args, future, loop)
+_WriteJob = Tuple[Callable, tuple, asyncio.Future, asyncio.AbstractEventLoop]
+
+class AsyncDatabase:
+    """Runs Database work off the event loop.
+
+    Reads run concurrently on a small thread pool. Writes are queued to a
+    single writer thread which drains whatever is pending and commits it as
+    one transaction (group commit), so a burst of writes costs one fsync.
+    Each write runs inside its own savepoint, so a failing write is rolled
+    back on its own without affecting the rest of the group.
+    """
+
+    def __init__(self, db: Database, readers: int = 4, max_batch: int = 256):
+        self.db = db
+        self.max_batch = max_batch
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='db-reader')
+        self._queue: "queue.Queue[Optional[_WriteJob]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name='db-writer', daemon=True)
+        self._writer.start()
+
+    async def read(self, fn: Callable, *args) -> Any:
+        """Run a blocking read on the reader pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, partial(fn, *args))
+
+    async def write(self, fn: Callable, *args) -> Any:
+        """Queue a cursor-level write for the writer thread"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((fn, args, future, loop))
+        return await future
+
+    # Reads
+
+    async def get_height(self) -> int:
+        return await self.read(self.db.get_height)
+
+    async def get_latest_block_hash(self) -> str:
+        return await self.read(self.db.get_latest_block_hash)
+
+    async def get_difficulty(self) -> int:
+        return await self.read(self.db.get_difficulty)
+
+    async def get_balance(self, address: str) -> int:
+        return await self.read(self.db.get_balance, address)
+
+    async def get_balances(self, addresses: List[str]) -> Dict[str, int]:
+        return await self.read(self.db.get_balances, addresses)
+
+    async def get_total_supply(self) -> int:
+        return await self.read(self.db.get_total_supply)
+
+    async def get_rich_list(self, limit: int = 100) -> List[Tuple[str, int]]:
+        return await self.read(self.db.get_rich_list, limit)
+
+    async def get_last_n_blocks(self, n: int) -> List[Dict]:
+        return await self.read(self.db.get_last_n_blocks, n)
+
+    async def get_block(self, block_id: str) -> Optional[Dict]:
+        return await self.read(self.db.get_block, block_id)
+
+    async def get_transaction(self, tx_hash: str) -> Optional[Dict]:
+        return await self.read(self.db.get_transaction, tx_hash)
+
+    async def get_address_history(self, address: str, limit: int = 50,
+                                  cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        return await self.read(self.db.get_address_history, address, limit, cursor)
+
+    # Writes
+
+    async def increase_difficulty(self):
+        await self.write(self.db._increase_difficulty)
+
+    async def decrease_difficulty(self):
+        await self.write(self.db._decrease_difficulty)
+
+    async def add_balance(self, address: str, amount: int):
+        await self.write(self.db._add_balance, address, amount)
+
+    async def subtract_balance(self, address: str, amount: int):
+        await self.write(self.db._subtract_balance, address, amount)
+
+    async def add_block(self, block_data: dict):
+        await self.write(self.db._insert_block, block_data)
+
+    async def apply_block(self, block_data: dict, reward: int):
+        await self.write(self.db._apply_block, block_data, reward)
+
+    def close(self):
+        """Flush pending writes and stop worker threads"""
+        self._queue.put(None)
+        self._writer.join()
+        self._readers.shutdown(wait=True)
+
+    def _write_loop(self):
+        """Writer thread: drain the queue and commit each batch once"""
+        conn = sqlite3.connect(self.db.db_path, isolation_level=None)
+        running = True
+        while running:
+            job = self._queue.get()
+            if job is None:
+                break
+
+            batch = [job]
+            while len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    running = False
+                    break
+                batch.append(job)
+
+            try:
+                self._commit_batch(conn, batch)
+            except Exception as e:
+                # Fail this batch only; later writes still get served
+                for _, _, future, loop in batch:
+                    _notify(loop, future, None, e)
+                conn = self._recover(conn)
+
+        conn.close()
+
+    def _recover(self, conn: sqlite3.Connection) -> sqlite3.Connection:
+        """Roll back a failed batch, reconnecting if the connection is unusable"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            return conn
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+            return sqlite3.connect(self.db.db_path, isolation_level=None)
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: List[_WriteJob]):
+        """Run a batch of writes in one transaction"""
+        c = conn.cursor()
+        results = []
+        c.execute('BEGIN')
+        for fn, args, future, loop in batch:
+            c.execute('SAVEPOINT job')
+            try:
+                result = fn(c, *args)
+                c.execute('RELEASE SAVEPOINT job')
+                results.append((future, loop, result, None))
+            except Exception as e:
+                c.execute('ROLLBACK TO SAVEPOINT job')
+                c.execute('RELEASE SAVEPOINT job')
+                results.append((future, loop, None, e))
+
+        try:
+            c.execute('COMMIT')
+        except Exception as e:
+            conn.rollback()
+            results = [(future, loop, None, e) for future, loop, _, _ in results]
+
+        for future, loop, result, error in results:
+            _notify(loop, future, result, error)
+
+def _notify(loop: asyncio.AbstractEventLoop, future: asyncio.Future,
+            result: Any, error: Optional[BaseException]):
+    """Hand a write result to the future's event loop from the writer thread"""
+    try:
+        loop.call_soon_threadsafe(_resolve, future, result, error)
+    except RuntimeError:
+        pass  # Loop already closed, nobody is waiting
+
+def _resolve(future: asyncio.Future, result: Any, error: Optional[BaseException]):
+    """Complete a write future on its event loop"""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
@@ -0,0 +1,60 @@
+"""Chain bootstrap files for TalantChain"""
+
+import struct
+import zlib
+from typing import BinaryIO, Callable, Iterator, Optional
+from .db import Database
+
+# File layout:
+#   magic + u32 format version
+#   frames: u32 payload length + u32 crc32 + block payload, until EOF
+MAGIC = b'TLNTBOOT'
+VERSION = 1
+FILE_HEADER = struct.Struct('<8sI')
+FRAME_HEADER = struct.Struct('<II')
+
+def write_frames(f: BinaryIO, payloads: Iterator[bytes]) -> int:
+    """Write block payloads as framed records, returning the count"""
+    f.write(FILE_HEADER.pack(MAGIC, VERSION))
+    count = 0
+    for payload in payloads:
+        f.write(FRAME_HEADER.pack(len(payload), zlib.crc32(payload)))
+        f.write(payload)
+        count += 1
+    return count
+
+def read_frames(f: BinaryIO) -> Iterator[bytes]:
+    """Read block payloads from framed records"""
+    header = f.read(FILE_HEADER.size)
+    if len(header) != FILE_HEADER.size:
+        raise ValueError("Not a bootstrap file")
+    magic, version = FILE_HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a bootstrap file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported bootstrap version {version}")
+
+    while True:
+        frame = f.read(FRAME_HEADER.size)
+        if not frame:
+            return
+        if len(frame) != FRAME_HEADER.size:
+            raise ValueError("Truncated bootstrap file")
+        length, checksum = FRAME_HEADER.unpack(frame)
+        payload = f.read(length)
+        if len(payload) != length:
+            raise ValueError("Truncated bootstrap file")
+        if zlib.crc32(payload) != checksum:
+            raise ValueError("Corrupt block in bootstrap file")
+        yield payload
+
+def export_chain(db: Database, path: str) -> int:
+    """Export every block to a bootstrap file"""
+    with open(path, 'wb') as f:
+        return write_frames(f, db.iter_block_payloads())
+
+def import_chain(db: Database, path: str, batch_size: int = 1000,
+                 progress: Optional[Callable[[int], None]] = None) -> int:
+    """Bulk import blocks from a bootstrap file"""
+    with open(path, 'rb') as f:
+        return db.bulk_import(read_frames(f), batch_size, progress)
@@ -0,0 +1,160 @@
+"""Binary block encoding for TalantChain database"""
+
+import struct
+import zlib
+from typing import Dict, List, Tuple, Union
+from ..core.transaction import pack_transaction, unpack_transaction
+from ..units import format_amount, to_atomic
+
+# Block payload layout (little endian):
+#   header       height, hash, prev hash, timestamp, difficulty, nonce, reward
+#   miner        u16 length + utf-8 address
+#   tx count     u32
+#   txs          u32 length + tx record, repeated
+#
+# Tx record:
+#   hash         32 bytes
+#   tx           canonical transaction encoding (see core.transaction)
+BLOCK_HEADER = struct.Struct('<Q32s32sQIQQ')
+HASH_SIZE = 32
+U16 = struct.Struct('<H')
+U32 = struct.Struct('<I')
+
+# Body flag stored in front of the payload
+RAW = 0
+ZLIB = 1
+COMPRESS_MIN_SIZE = 512
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+def _hash_bytes(value: str, name: str) -> bytes:
+    """Decode hex hash, which the fixed-width layout needs to be 32 bytes"""
+    data = bytes.fromhex(value)
+    if len(data) != HASH_SIZE:
+        raise ValueError(f"Invalid {name}: expected {HASH_SIZE} bytes")
+    return data
+
+def encode_transaction(tx: Dict) -> bytes:
+    """Encode transaction dict to a tx record"""
+    return _hash_bytes(tx['hash'], 'transaction hash') + pack_transaction(
+        to_atomic(tx['amount']),
+        to_atomic(tx.get('fee', '0')),
+        tx['timestamp'],
+        tx['sender'],
+        tx['recipient'],
+        tx.get('signature') or '',
+        bytes.fromhex(tx['key_image']) if tx.get('key_image') else b''
+    )
+
+def decode_transaction(buf: Buffer, offset: int = 0) -> Dict:
+    """Decode tx record starting at offset"""
+    view = memoryview(buf)
+    tx_hash = view[offset:offset + 32].hex()
+    amount, fee, timestamp, sender, recipient, signature, key_image, _ = \
+        unpack_transaction(view, offset + 32)
+
+    tx = {
+        'sender': sender,
+        'recipient': recipient,
+        'amount': format_amount(amount),
+        'timestamp': timestamp
+    }
+    if fee:
+        tx['fee'] = format_amount(fee)
+    if key_image:
+        tx['key_image'] = key_image.hex()
+    if signature:
+        tx['signature'] = signature
+    tx['hash'] = tx_hash
+    return tx
+
+def encode_block(block_data: Dict) -> Tuple[bytes, List[int]]:
+    """Encode block dict to a payload.
+
+    Returns the payload and the offset of each tx record's length prefix,
+    which the transactions table stores to find a tx without decoding the
+    whole block.
+    """
+    miner = block_data['miner_address'].encode()
+    parts = [
+        BLOCK_HEADER.pack(
+            block_data['height'],
+            _hash_bytes(block_data['hash'], 'block hash'),
+            _hash_bytes(block_data['previous_hash'], 'previous hash'),
+            block_data['timestamp'],
+            block_data['difficulty'],
+            block_data['nonce'],
+            to_atomic(block_data['reward'])
+        ),
+        U16.pack(len(miner)),
+        miner,
+        U32.pack(len(block_data['transactions']))
+    ]
+    offset = sum(len(part) for part in parts)
+
+    offsets = []
+    for tx in block_data['transactions']:
+        record = encode_transaction(tx)
+        offsets.append(offset)
+        parts.append(U32.pack(len(record)))
+        parts.append(record)
+        offset += U32.size + len(record)
+
+    return b''.join(parts), offsets
+
+def decode_block(payload: Buffer) -> Dict:
+    """Decode block payload to block dict"""
+    return decode_block_with_offsets(payload)[0]
+
+def decode_block_with_offsets(payload: Buffer) -> Tuple[Dict, List[int]]:
+    """Decode block payload, also returning the tx record offsets"""
+    view = memoryview(payload)
+    height, block_hash, prev_hash, timestamp, difficulty, nonce, reward = \
+        BLOCK_HEADER.unpack_from(view, 0)
+    offset = BLOCK_HEADER.size
+
+    (length,) = U16.unpack_from(view, offset)
+    offset += U16.size
+    miner_address = str(view[offset:offset + length], 'utf-8')
+    offset += length
+
+    (count,) = U32.unpack_from(view, offset)
+    offset += U32.size
+
+    transactions = []
+    offsets = []
+    for _ in range(count):
+        (length,) = U32.unpack_from(view, offset)
+        transactions.append(decode_transaction(view, offset + U32.size))
+        offsets.append(offset)
+        offset += U32.size + length
+
+    return {
+        'height': height,
+        'hash': block_hash.hex(),
+        'previous_hash': prev_hash.hex(),
+        'timestamp': timestamp,
+        'difficulty': difficulty,
+        'nonce': nonce,
+        'miner_address': miner_address,
+        'transactions': transactions,
+        'reward': format_amount(reward)
+    }, offsets
+
+def decode_transaction_at(payload: Buffer, offset: int) -> Dict:
+    """Decode the tx whose length prefix is at offset in a block payload"""
+    return decode_transaction(payload, offset + U32.size)
+
+def pack_body(payload: bytes) -> bytes:
+    """Wrap payload for storage, compressing it when that pays off"""
+    if len(payload) >= COMPRESS_MIN_SIZE:
+        compressed = zlib.compress(payload)
+        if len(compressed) < len(payload):
+            return bytes((ZLIB,)) + compressed
+    return bytes((RAW,)) + payload
+
+def unpack_body(body: bytes) -> Buffer:
+    """Get payload from a stored body"""
+    if body[0] == ZLIB:
+        return zlib.decompress(memoryview(body)[1:])
+    return memoryview(body)[1:]
@@ -2,23 +2,52 @@
 
 import sqlite3
 import json
-from decimal import Decimal
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from ..units import COIN, format_amount, to_atomic
+from .codec import (
+    decode_block, decode_block_with_offsets, decode_transaction_at,
+    encode_block, pack_body, unpack_body
+)
 
-class Database:
-    def __init__(self, db_path: str = "blockchain.db"):
-        self.db_path = db_path
-        self._init_db()
+# Secondary indexes, kept in one place so bulk loads can drop and rebuild them.
+# The address indexes cover the history query, so it never touches the table.
+INDEXES = {
+    'idx_transactions_sender':
+        'transactions(sender, block_height, hash, recipient, amount, fee, timestamp)',
+    'idx_transactions_recipient':
+        'transactions(recipient, block_height, hash, sender, amount, fee, timestamp)',
+    'idx_transactions_block_height': 'transactions(block_height)',
+    'idx_blocks_timestamp': 'blocks(timestamp)',
+    'idx_balances_amount': 'balances(amount)',
+}
 
-    def _init_db(self):
-        """Initialize database tables"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+# Balance change rows for blocks in a height range; bind (start, end) once per
+# branch. Rewards and fees go to the miner, senders pay amount plus fee.
+BALANCE_DELTAS = '''
+    SELECT miner_address AS address, reward AS delta
+    FROM blocks WHERE height BETWEEN ? AND ?
+    UNION ALL
+    SELECT recipient, amount
+    FROM transactions WHERE block_height BETWEEN ? AND ?
+    UNION ALL
+    SELECT sender, -(amount + fee)
+    FROM transactions WHERE block_height BETWEEN ? AND ?
+    UNION ALL
+    SELECT b.miner_address, t.fee
+    FROM transactions t JOIN blocks b ON b.height = t.block_height
+    WHERE t.block_height BETWEEN ? AND ?
+'''
 
-        # Create blocks table
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS blocks (
+# Schema version, stored in PRAGMA user_version
+#   1: amounts stored as integer atomic units
+#   2: block bodies stored as binary blobs, txs referenced by offset
+SCHEMA_VERSION = 2
+
+TABLES = {
+    'blocks': '''
+        CREATE TABLE IF NOT EXISTS {name} (
             height INTEGER PRIMARY KEY,
             hash TEXT UNIQUE,
             previous_hash TEXT,
@@ -26,35 +55,119 @@ class Database:
             difficulty INTEGER,
             nonce INTEGER,
             miner_address TEXT,
-            transactions TEXT,
-            reward DECIMAL(16,8)
+            reward INTEGER,
+            body BLOB
         )
-        ''')
-
-        # Create balances table
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS balances (
+    ''',
+    'balances': '''
+        CREATE TABLE IF NOT EXISTS {name} (
             address TEXT PRIMARY KEY,
-            amount DECIMAL(16,8) DEFAULT 0
+            amount INTEGER NOT NULL DEFAULT 0
         )
-        ''')
-
-        # Create transactions table
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS transactions (
+    ''',
+    'transactions': '''
+        CREATE TABLE IF NOT EXISTS {name} (
             hash TEXT PRIMARY KEY,
             sender TEXT,
             recipient TEXT,
-            amount DECIMAL(16,8),
+            amount INTEGER,
+            fee INTEGER NOT NULL DEFAULT 0,
             timestamp INTEGER,
             block_height INTEGER,
+            tx_offset INTEGER,
             FOREIGN KEY(block_height) REFERENCES blocks(height)
         )
-        ''')
+    ''',
+    # Key images of ring-signed transactions, each spendable once
+    'key_images': '''
+        CREATE TABLE IF NOT EXISTS {name} (
+            image BLOB PRIMARY KEY,
+            height INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''',
+}
+
+class Database:
+    def __init__(self, db_path: str = "blockchain.db"):
+        self.db_path = db_path
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize database tables and migrate old schemas"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+
+        # WAL lets readers run concurrently with the writer
+        c.execute('PRAGMA journal_mode=WAL')
+
+        c.execute('PRAGMA user_version')
+        version = c.fetchone()[0]
+        c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'blocks'")
+        if c.fetchone() is None:
+            version = SCHEMA_VERSION  # New database, nothing to migrate
+
+        for name, ddl in TABLES.items():
+            c.execute(ddl.format(name=name))
+
+        if version < 1:
+            self._migrate_integer_amounts(c)
+        if version < 2:
+            self._migrate_binary_blocks(c)
+
+        self._create_indexes(c)
+        c.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
 
         conn.commit()
         conn.close()
 
+    def _migrate_integer_amounts(self, c: sqlite3.Cursor):
+        """Convert DECIMAL amounts (stored by SQLite as REAL) to atomic units"""
+        self._rebuild_table(c, 'balances', f'''
+            SELECT address, CAST(ROUND(COALESCE(amount, 0) * {COIN}) AS INTEGER)
+            FROM balances
+        ''')
+        # Transactions are rebuilt from the block JSON by the next migration
+        c.execute(f'''
+        UPDATE blocks SET reward = CAST(ROUND(COALESCE(reward, 0) * {COIN}) AS INTEGER)
+        ''')
+
+    def _migrate_binary_blocks(self, c: sqlite3.Cursor):
+        """Re-encode JSON block transactions as binary bodies"""
+        c.execute('ALTER TABLE blocks RENAME TO blocks_old')
+        c.execute('ALTER TABLE transactions RENAME TO transactions_old')
+        c.execute(TABLES['blocks'].format(name='blocks'))
+        c.execute(TABLES['transactions'].format(name='transactions'))
+
+        rows = c.connection.execute('''
+        SELECT height, hash, previous_hash, timestamp, difficulty,
+               nonce, miner_address, transactions, reward
+        FROM blocks_old ORDER BY height
+        ''')
+        for row in rows:
+            self._insert_block(c, {
+                'height': row[0],
+                'hash': row[1],
+                'previous_hash': row[2],
+                'timestamp': row[3],
+                'difficulty': row[4],
+                'nonce': row[5],
+                'miner_address': row[6],
+                'transactions': json.loads(row[7]),
+                'reward': format_amount(row[8])
+            })
+
+        c.execute('DROP TABLE transactions_old')
+        c.execute('DROP TABLE blocks_old')
+
+    @staticmethod
+    def _rebuild_table(c: sqlite3.Cursor, name: str, select: str):
+        """Recreate table with its current schema, filling it from select"""
+        c.execute(f'DROP TABLE IF EXISTS {name}_new')
+        c.execute(TABLES[name].format(name=f'{name}_new'))
+        c.execute(f'INSERT INTO {name}_new {select}')
+        c.execute(f'DROP TABLE {name}')
+        c.execute(f'ALTER TABLE {name}_new RENAME TO {name}')
+
     def get_height(self) -> int:
         """Get current blockchain height"""
         conn = sqlite3.connect(self.db_path)
@@ -82,74 +195,193 @@ class Database:
         conn.close()
         return result[0] if result else 1
 
-    def increase_difficulty(self):
-        """Increase mining difficulty"""
-        current = self.get_difficulty()
+    def get_headers(self) -> List[Tuple[int, str, int, int]]:
+        """Get (height, hash, timestamp, difficulty) of all blocks in order"""
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
-        c.execute('UPDATE blocks SET difficulty = ? WHERE height = (SELECT MAX(height) FROM blocks)',
-                 (current + 1,))
-        conn.commit()
+        c.execute('SELECT height, hash, timestamp, difficulty FROM blocks ORDER BY height')
+        headers = c.fetchall()
         conn.close()
+        return headers
+
+    def increase_difficulty(self):
+        """Increase mining difficulty"""
+        self._write(self._increase_difficulty)
 
     def decrease_difficulty(self):
         """Decrease mining difficulty"""
-        current = self.get_difficulty()
-        if current > 1:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            c.execute('UPDATE blocks SET difficulty = ? WHERE height = (SELECT MAX(height) FROM blocks)',
-                     (current - 1,))
-            conn.commit()
-            conn.close()
+        self._write(self._decrease_difficulty)
 
-    def get_balance(self, address: str) -> Decimal:
-        """Get balance for address"""
+    def get_balance(self, address: str) -> int:
+        """Get balance for address in atomic units"""
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
         c.execute('SELECT amount FROM balances WHERE address = ?', (address,))
         result = c.fetchone()
         conn.close()
-        return Decimal(str(result[0])) if result else Decimal('0')
+        return result[0] if result else 0
 
-    def add_balance(self, address: str, amount: Decimal):
-        """Add amount to address balance"""
+    def get_balances(self, addresses: Iterable[str]) -> Dict[str, int]:
+        """Get balances for several addresses in atomic units"""
+        addresses = list(set(addresses))
+        balances = dict.fromkeys(addresses, 0)
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
-        current = self.get_balance(address)
-        new_amount = current + amount
-        c.execute('''
-        INSERT INTO balances (address, amount) VALUES (?, ?)
-        ON CONFLICT(address) DO UPDATE SET amount = ?
-        ''', (address, new_amount, new_amount))
-        conn.commit()
+        # Stay under SQLite's bound parameter limit
+        for i in range(0, len(addresses), 500):
+            chunk = addresses[i:i + 500]
+            c.execute('SELECT address, amount FROM balances WHERE address IN (%s)'
+                      % ','.join('?' * len(chunk)), chunk)
+            balances.update(c.fetchall())
         conn.close()
+        return balances
 
-    def subtract_balance(self, address: str, amount: Decimal):
-        """Subtract amount from address balance"""
+    def get_spent_key_images(self, images: Iterable[bytes]) -> Set[bytes]:
+        """Get which of images are spent in stored blocks"""
+        images = list(set(images))
+        spent = set()
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
-        current = self.get_balance(address)
-        new_amount = current - amount
-        if new_amount < 0:
-            raise ValueError("Insufficient balance")
-        c.execute('''
-        INSERT INTO balances (address, amount) VALUES (?, ?)
-        ON CONFLICT(address) DO UPDATE SET amount = ?
-        ''', (address, new_amount, new_amount))
-        conn.commit()
+        # Stay under SQLite's bound parameter limit
+        for i in range(0, len(images), 500):
+            chunk = images[i:i + 500]
+            c.execute('SELECT image FROM key_images WHERE image IN (%s)'
+                      % ','.join('?' * len(chunk)), chunk)
+            spent.update(row[0] for row in c.fetchall())
+        conn.close()
+        return spent
+
+    def iter_key_images(self) -> Iterator[bytes]:
+        """Yield every spent key image"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for (image,) in conn.execute('SELECT image FROM key_images'):
+                yield image
+        finally:
+            conn.close()
+
+    def count_key_images(self) -> int:
+        """Get number of spent key images"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute('SELECT COUNT(*) FROM key_images')
+        count = c.fetchone()[0]
+        conn.close()
+        return count
+
+    def get_total_supply(self) -> int:
+        """Get sum of all balances in atomic units"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute('SELECT COALESCE(SUM(amount), 0) FROM balances')
+        supply = c.fetchone()[0]
+        conn.close()
+        return supply
+
+    def get_rich_list(self, limit: int = 100) -> List[Tuple[str, int]]:
+        """Get (address, balance) of the largest holders"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute('SELECT address, amount FROM balances ORDER BY amount DESC LIMIT ?', (limit,))
+        rich_list = c.fetchall()
         conn.close()
+        return rich_list
+
+    def add_balance(self, address: str, amount: int):
+        """Add amount to address balance"""
+        self._write(self._add_balance, address, amount)
+
+    def subtract_balance(self, address: str, amount: int):
+        """Subtract amount from address balance"""
+        self._write(self._subtract_balance, address, amount)
 
     def add_block(self, block_data: dict):
         """Add new block to blockchain"""
+        self._write(self._insert_block, block_data)
+
+    def apply_block(self, block_data: dict, reward: int):
+        """Apply block reward, transfers and block rows in one transaction"""
+        self._write(self._apply_block, block_data, reward)
+
+    def _write(self, fn: Callable, *args):
+        """Run a cursor-level write in its own transaction"""
         conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
+        try:
+            with conn:
+                return fn(conn.cursor(), *args)
+        finally:
+            conn.close()
+
+    # Cursor-level writes. These never commit, so callers can group several
+    # of them into one transaction (see AsyncDatabase).
+
+    def _increase_difficulty(self, c: sqlite3.Cursor):
+        c.execute('''
+        UPDATE blocks SET difficulty = difficulty + 1
+        WHERE height = (SELECT MAX(height) FROM blocks)
+        ''')
+
+    def _decrease_difficulty(self, c: sqlite3.Cursor):
+        c.execute('''
+        UPDATE blocks SET difficulty = difficulty - 1
+        WHERE height = (SELECT MAX(height) FROM blocks) AND difficulty > 1
+        ''')
+
+    def _add_balance(self, c: sqlite3.Cursor, address: str, amount: int):
+        c.execute('''
+        INSERT INTO balances (address, amount) VALUES (?, ?)
+        ON CONFLICT(address) DO UPDATE SET amount = amount + excluded.amount
+        ''', (address, amount))
+
+    def _subtract_balance(self, c: sqlite3.Cursor, address: str, amount: int):
+        c.execute('SELECT amount FROM balances WHERE address = ?', (address,))
+        result = c.fetchone()
+        current = result[0] if result else 0
+        if current - amount < 0:
+            raise ValueError("Insufficient balance")
+        self._add_balance(c, address, -amount)
+
+    def _apply_block(self, c: sqlite3.Cursor, block_data: dict, reward: int):
+        # Aggregate balance deltas per address
+        deltas: Dict[str, int] = defaultdict(int)
+        deltas[block_data['miner_address']] += reward
+        for tx in block_data['transactions']:
+            amount = to_atomic(tx['amount'])
+            fee = to_atomic(tx.get('fee', '0'))
+            deltas[tx['sender']] -= amount + fee
+            deltas[tx['recipient']] += amount
+            deltas[block_data['miner_address']] += fee
+
+        c.executemany('''
+        INSERT INTO balances (address, amount) VALUES (?, ?)
+        ON CONFLICT(address) DO UPDATE SET amount = amount + excluded.amount
+        ''', [(address, delta) for address, delta in deltas.items() if delta])
+
+        # Reject the whole block if any sender went negative
+        debited = [address for address, delta in deltas.items() if delta < 0]
+        if debited:
+            c.execute(
+                'SELECT address FROM balances WHERE amount < 0 AND address IN (%s)'
+                % ','.join('?' * len(debited)),
+                debited
+            )
+            if c.fetchone():
+                raise ValueError("Insufficient balance")
+
+        # Store the reward actually credited, which balance rebuilds replay
+        self._insert_block(c, dict(block_data, reward=format_amount(reward)))
+
+    def _insert_block(self, c: sqlite3.Cursor, block_data: dict):
+        payload, offsets = encode_block(block_data)
+        self._insert_encoded_block(c, block_data, payload, offsets)
+
+    def _insert_encoded_block(self, c: sqlite3.Cursor, block_data: dict,
+                              payload: bytes, offsets: List[int]):
         # Insert block
         c.execute('''
         INSERT INTO blocks (
             height, hash, previous_hash, timestamp, difficulty,
-            nonce, miner_address, transactions, reward
+            nonce, miner_address, reward, body
         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             block_data['height'],
@@ -159,51 +391,266 @@ class Database:
             block_data['difficulty'],
             block_data['nonce'],
             block_data['miner_address'],
-            json.dumps(block_data['transactions']),
-            block_data['reward']
+            to_atomic(block_data['reward']),
+            pack_body(payload)
         ))
-        
-        # Insert transactions
-        for tx in block_data['transactions']:
-            c.execute('''
-            INSERT INTO transactions (
-                hash, sender, recipient, amount, timestamp, block_height
-            ) VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                tx['hash'],
-                tx['sender'],
-                tx['recipient'],
-                tx['amount'],
-                tx['timestamp'],
-                block_data['height']
-            ))
-        
-        conn.commit()
+
+        # Insert transactions, pointing at their record in the block body
+        c.executemany('''
+        INSERT INTO transactions (
+            hash, sender, recipient, amount, fee, timestamp, block_height, tx_offset
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(
+            tx['hash'],
+            tx['sender'],
+            tx['recipient'],
+            to_atomic(tx['amount']),
+            to_atomic(tx.get('fee', '0')),
+            tx['timestamp'],
+            block_data['height'],
+            offset
+        ) for tx, offset in zip(block_data['transactions'], offsets)])
+
+        # Spend key images in the same transaction as the block
+        images = [(bytes.fromhex(tx['key_image']), block_data['height'])
+                  for tx in block_data['transactions'] if tx.get('key_image')]
+        try:
+            c.executemany(
+                'INSERT INTO key_images (image, height) VALUES (?, ?)', images
+            )
+        except sqlite3.IntegrityError:
+            raise ValueError("Key image already spent")
+
+    def iter_block_payloads(self) -> Iterator[bytes]:
+        """Yield every block payload in height order"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for (body,) in conn.execute('SELECT body FROM blocks ORDER BY height'):
+                yield bytes(unpack_body(body))
+        finally:
+            conn.close()
+
+    def bulk_import(self, payloads: Iterable[bytes], batch_size: int = 1000,
+                    progress: Optional[Callable[[int], None]] = None) -> int:
+        """Bulk load block payloads on top of the current chain.
+
+        Blocks at or below the current height are skipped, so an interrupted
+        import can simply be rerun. Each batch of blocks is one transaction,
+        secondary indexes are dropped for the load and rebuilt at the end, and
+        balances are recomputed from the full chain in a single SQL pass
+        rather than block by block. Returns the number of blocks imported.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        c = conn.cursor()
+        # The import can be rerun from the bootstrap file if the machine
+        # crashes, so skip the per-commit fsync
+        c.execute('PRAGMA synchronous=OFF')
+        for name in INDEXES:
+            c.execute(f'DROP INDEX IF EXISTS {name}')
+
+        c.execute('SELECT height, hash FROM blocks ORDER BY height DESC LIMIT 1')
+        tip = c.fetchone() or (0, "0" * 64)
+        height, tip_hash = tip
+
+        imported = 0
+        try:
+            batch = 0
+            c.execute('BEGIN')
+            for payload in payloads:
+                block_data, offsets = decode_block_with_offsets(payload)
+                if block_data['height'] <= height:
+                    continue
+                if (block_data['height'] != height + 1
+                        or block_data['previous_hash'] != tip_hash):
+                    raise ValueError(f"Block {block_data['height']} does not extend the chain")
+
+                self._insert_encoded_block(c, block_data, payload, offsets)
+                height, tip_hash = block_data['height'], block_data['hash']
+                imported += 1
+                batch += 1
+
+                if batch == batch_size:
+                    c.execute('COMMIT')
+                    if progress:
+                        progress(imported)
+                    batch = 0
+                    c.execute('BEGIN')
+            c.execute('COMMIT')
+        except Exception:
+            c.execute('ROLLBACK')
+            raise
+        finally:
+            c.execute('BEGIN')
+            self._create_indexes(c)
+            self._rebuild_balances(c)
+            c.execute('COMMIT')
+            conn.close()
+
+        return imported
+
+    @staticmethod
+    def _rebuild_balances(c: sqlite3.Cursor):
+        """Recompute every balance from block rewards and transactions"""
+        c.execute('DELETE FROM balances')
+        c.execute(f'''
+        INSERT INTO balances (address, amount)
+        SELECT address, SUM(delta) FROM ({BALANCE_DELTAS})
+        GROUP BY address
+        HAVING SUM(delta) != 0
+        ''', (0, 2 ** 63 - 1) * 4)
+
+    def get_state(self) -> Tuple[int, str, List[Tuple[str, int]]]:
+        """Get tip height, tip hash and all balances as of one instant"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        c = conn.cursor()
+        # Both reads come from the same WAL snapshot
+        c.execute('BEGIN')
+        c.execute('SELECT height, hash FROM blocks ORDER BY height DESC LIMIT 1')
+        height, tip_hash = c.fetchone() or (0, "0" * 64)
+        c.execute('SELECT address, amount FROM balances WHERE amount != 0 ORDER BY address')
+        balances = c.fetchall()
+        c.execute('COMMIT')
         conn.close()
+        return height, tip_hash, balances
+
+    def get_balance_deltas(self, start: int, end: int) -> Dict[str, int]:
+        """Get net balance change per address over blocks start..end inclusive"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute(f'''
+        SELECT address, SUM(delta) FROM ({BALANCE_DELTAS})
+        GROUP BY address
+        ''', (start, end) * 4)
+        deltas = dict(c.fetchall())
+        conn.close()
+        return deltas
+
+    def restore_state(self, height: int, block_hash: str, balances: Iterable[Tuple[str, int]]) -> int:
+        """Load balances snapshotted at height and replay the blocks after it.
+
+        Fails if the stored chain no longer has block_hash at height. Returns
+        the number of blocks replayed.
+        """
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        try:
+            with conn:
+                if height:
+                    c.execute('SELECT hash FROM blocks WHERE height = ?', (height,))
+                    row = c.fetchone()
+                    if row is None or row[0] != block_hash:
+                        raise ValueError(f"Snapshot block {height} is not on the stored chain")
+
+                c.execute('DELETE FROM balances')
+                c.executemany('INSERT INTO balances (address, amount) VALUES (?, ?)', balances)
+                c.execute(f'''
+                INSERT INTO balances (address, amount)
+                SELECT address, SUM(delta) FROM ({BALANCE_DELTAS})
+                GROUP BY address
+                HAVING SUM(delta) != 0
+                ON CONFLICT(address) DO UPDATE SET amount = amount + excluded.amount
+                ''', (height + 1, 2 ** 63 - 1) * 4)
+                c.execute('DELETE FROM balances WHERE amount = 0')
+
+                c.execute('SELECT COUNT(*) FROM blocks WHERE height > ?', (height,))
+                return c.fetchone()[0]
+        finally:
+            conn.close()
 
     def get_last_n_blocks(self, n: int) -> List[Dict]:
         """Get last n blocks"""
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
-        c.execute('''
-        SELECT height, hash, previous_hash, timestamp, difficulty,
-               nonce, miner_address, transactions, reward
-        FROM blocks ORDER BY height DESC LIMIT ?
-        ''', (n,))
+        c.execute('SELECT body FROM blocks ORDER BY height DESC LIMIT ?', (n,))
         
-        blocks = []
-        for row in c.fetchall():
-            blocks.append({
-                'height': row[0],
-                'hash': row[1],
-                'previous_hash': row[2],
-                'timestamp': row[3],
-                'difficulty': row[4],
-                'nonce': row[5],
-                'miner_address': row[6],
-                'transactions': json.loads(row[7]),
-                'reward': str(row[8])
-            })
+        blocks = [decode_block(unpack_body(row[0])) for row in c.fetchall()]
         
         conn.close()
         return blocks
+
+    def get_block(self, block_id: str) -> Optional[Dict]:
+        """Get block by height or hash"""
+        column = 'height' if block_id.isdecimal() else 'hash'
+        key = int(block_id) if column == 'height' else block_id
+        if column == 'height' and key > 2 ** 63 - 1:
+            return None  # Past any SQLite INTEGER, so no such block
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute('SELECT body FROM blocks WHERE %s = ?' % column, (key,))
+        row = c.fetchone()
+        conn.close()
+        return decode_block(unpack_body(row[0])) if row else None
+
+    def get_transaction(self, tx_hash: str) -> Optional[Dict]:
+        """Get confirmed transaction by hash"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute('''
+        SELECT t.block_height, t.tx_offset, b.body
+        FROM transactions t JOIN blocks b ON b.height = t.block_height
+        WHERE t.hash = ?
+        ''', (tx_hash,))
+        row = c.fetchone()
+        conn.close()
+        if not row:
+            return None
+        tx = decode_transaction_at(unpack_body(row[2]), row[1])
+        tx['block_height'] = row[0]
+        return tx
+
+    def get_address_history(self, address: str, limit: int = 50,
+                            cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get transactions sent or received by address, newest first.
+
+        Pages are keyed on (block_height, hash) rather than OFFSET, so every
+        page is a range scan on the covering address indexes. Returns the page
+        and the cursor for the next one, or None on the last page.
+        """
+        if cursor:
+            height, tx_hash = cursor.split(':', 1)
+            after = (int(height), tx_hash)
+        else:
+            after = (2 ** 63 - 1, '')
+
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute('''
+        SELECT * FROM (
+            SELECT hash, sender, recipient, amount, fee, timestamp, block_height
+            FROM transactions
+            WHERE sender = ? AND (block_height, hash) < (?, ?)
+            ORDER BY block_height DESC, hash DESC LIMIT ?
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT hash, sender, recipient, amount, fee, timestamp, block_height
+            FROM transactions
+            WHERE recipient = ? AND sender != ? AND (block_height, hash) < (?, ?)
+            ORDER BY block_height DESC, hash DESC LIMIT ?
+        )
+        ORDER BY block_height DESC, hash DESC LIMIT ?
+        ''', (address, *after, limit, address, address, *after, limit, limit))
+        rows = c.fetchall()
+        conn.close()
+
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = f"{rows[-1][6]}:{rows[-1][0]}"
+        return [self._transaction_from_row(row) for row in rows], next_cursor
+
+    @staticmethod
+    def _transaction_from_row(row: tuple) -> Dict:
+        return {
+            'hash': row[0],
+            'sender': row[1],
+            'recipient': row[2],
+            'amount': format_amount(row[3]),
+            'fee': format_amount(row[4]),
+            'timestamp': row[5],
+            'block_height': row[6]
+        }
+
+    @staticmethod
+    def _create_indexes(c: sqlite3.Cursor):
+        for name, definition in INDEXES.items():
+            c.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {definition}')
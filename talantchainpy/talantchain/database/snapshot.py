@@ -0,0 +1,122 @@
+"""Balance snapshots for TalantChain"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ..config import get_data_dir
+from .db import Database
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_KEEP = 3  # Snapshots kept on disk
+
+def snapshot_dir() -> Path:
+    """Get directory holding balance snapshots"""
+    path = get_data_dir() / "snapshots"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def balances_checksum(balances: List[Tuple[str, int]]) -> str:
+    """Get sha256 over address-sorted balances"""
+    h = hashlib.sha256()
+    for address, amount in balances:
+        h.update(f"{address}:{amount}\n".encode())
+    return h.hexdigest()
+
+def write_snapshot(db: Database, directory: Optional[Path] = None) -> Path:
+    """Write a consistent balance snapshot tagged with the tip height and hash.
+
+    The file is written to a temporary name, fsynced and then renamed into
+    place, so a crash never leaves a partial snapshot behind.
+    """
+    directory = directory or snapshot_dir()
+    height, tip_hash, balances = db.get_state()
+    data = {
+        'version': SNAPSHOT_VERSION,
+        'height': height,
+        'hash': tip_hash,
+        'checksum': balances_checksum(balances),
+        'balances': balances
+    }
+
+    path = directory / f"snapshot-{height:010d}.json"
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    # Persist the rename itself
+    if os.name != 'nt':
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    for old in list_snapshots(directory)[:-SNAPSHOT_KEEP]:
+        old.unlink()
+    return path
+
+def list_snapshots(directory: Optional[Path] = None) -> List[Path]:
+    """List snapshot files, oldest first"""
+    directory = directory or snapshot_dir()
+    return sorted(directory.glob("snapshot-*.json"))
+
+def read_snapshot(path: Path) -> Dict:
+    """Read snapshot file and check its checksum"""
+    with open(path) as f:
+        data = json.load(f)
+    if data.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version in {path.name}")
+    balances = [tuple(entry) for entry in data['balances']]
+    if balances_checksum(balances) != data['checksum']:
+        raise ValueError(f"Snapshot {path.name} is corrupt")
+    data['balances'] = balances
+    return data
+
+def rebuild_state(db: Database, directory: Optional[Path] = None) -> Tuple[int, int]:
+    """Restore balances from the newest usable snapshot, replaying later blocks.
+
+    Snapshots that are corrupt or no longer on the stored chain are skipped;
+    with none left, balances are replayed from genesis. Returns the snapshot
+    height used and the number of blocks replayed.
+    """
+    for path in reversed(list_snapshots(directory)):
+        try:
+            snapshot = read_snapshot(path)
+            replayed = db.restore_state(snapshot['height'], snapshot['hash'], snapshot['balances'])
+            return snapshot['height'], replayed
+        except (ValueError, KeyError):
+            continue
+    return 0, db.restore_state(0, "0" * 64, [])
+
+def verify_state(db: Database, workers: int = 4,
+                 chunk_size: int = 10000) -> List[Tuple[str, int, int]]:
+    """Check live balances against a full replay of the chain.
+
+    The replay is split into height ranges summed concurrently (SQLite
+    releases the GIL while a query runs) and merged. Returns
+    (address, live balance, replayed balance) for every mismatch.
+    """
+    height, _, balances = db.get_state()
+    ranges = [(start, min(start + chunk_size - 1, height))
+              for start in range(1, height + 1, chunk_size)]
+
+    replayed: Dict[str, int] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for deltas in executor.map(lambda r: db.get_balance_deltas(*r), ranges):
+            for address, delta in deltas.items():
+                replayed[address] = replayed.get(address, 0) + delta
+
+    live = dict(balances)
+    mismatches = []
+    for address in sorted(live.keys() | replayed.keys()):
+        expected = replayed.get(address, 0)
+        actual = live.get(address, 0)
+        if actual != expected:
+            mismatches.append((address, actual, expected))
+    return mismatches
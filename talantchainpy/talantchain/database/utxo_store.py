@@ -0,0 +1,204 @@
+"""Disk-backed UTXO set for the in-memory chain"""
+
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from ..core.bloom import KeyImageIndex
+
+OUTPOINT_INDEX = struct.Struct('<I')
+OUTPOINT_SIZE = 32 + OUTPOINT_INDEX.size
+
+def outpoint(tx_hash: bytes, index: int) -> bytes:
+    """Get 36-byte key of output index of tx_hash"""
+    return tx_hash + OUTPOINT_INDEX.pack(index)
+
+class UTXOSet:
+    """Unspent outputs keyed by binary outpoint, stored in SQLite.
+
+    Changes are written back: adds and spends are held in memory until
+    write_pending() runs inside the transaction storing the block, then
+    mark_written() moves them to a bounded read cache. The height of the
+    last block written is stored alongside, so a chain can tell on reopen
+    whether the set matches its tip.
+
+    Key images of spent ring inputs are kept in the same store and flushed
+    in the same transaction, with a Bloom filter of all of them in memory
+    so that checking an unspent key image never reads the disk.
+    """
+
+    def __init__(self, db_path: str, cache_size: int = 100000,
+                 key_image_capacity: int = 1000000):
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        # outpoint -> value, or None for a spend not yet flushed
+        self._dirty: Dict[bytes, Optional[bytes]] = {}
+        self._clean: "OrderedDict[bytes, bytes]" = OrderedDict()
+        # key image -> height of the block spending it, not yet flushed
+        self._new_images: Dict[bytes, int] = {}
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS utxos (
+                outpoint BLOB PRIMARY KEY,
+                value BLOB NOT NULL
+            ) WITHOUT ROWID
+            ''')
+            self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS utxo_state (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                height INTEGER NOT NULL
+            )
+            ''')
+            self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS key_images (
+                image BLOB PRIMARY KEY,
+                height INTEGER NOT NULL
+            ) WITHOUT ROWID
+            ''')
+            self._load_key_images(key_image_capacity)
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Get value locked by an unspent output, or None"""
+        with self._lock:
+            if key in self._dirty:
+                return self._dirty[key]
+            value = self._clean.get(key)
+            if value is not None:
+                self._clean.move_to_end(key)
+                return value
+
+            row = self._conn.execute(
+                'SELECT value FROM utxos WHERE outpoint = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._cache(key, row[0])
+            return row[0]
+
+    def __contains__(self, key: bytes) -> bool:
+        return self.get(key) is not None
+
+    def add(self, key: bytes, value: bytes):
+        """Record a new unspent output"""
+        with self._lock:
+            self._clean.pop(key, None)
+            self._dirty[key] = value
+
+    def spend(self, key: bytes):
+        """Mark an output as spent"""
+        with self._lock:
+            self._clean.pop(key, None)
+            self._dirty[key] = None
+
+    def is_key_image_spent(self, image: bytes) -> bool:
+        """Check whether a key image was already spent"""
+        with self._lock:
+            if image not in self._images:
+                return False  # Definitely unspent, no disk read
+            if image in self._new_images:
+                return True
+            return self._conn.execute(
+                'SELECT 1 FROM key_images WHERE image = ?', (image,)
+            ).fetchone() is not None
+
+    def spend_key_image(self, image: bytes, height: int):
+        """Record a key image spent by the block at height"""
+        with self._lock:
+            self._new_images[image] = height
+            self._images.add(image)
+
+    @property
+    def height(self) -> Optional[int]:
+        """Height of the last block written, None if never written"""
+        with self._lock:
+            row = self._conn.execute('SELECT height FROM utxo_state').fetchone()
+        return row[0] if row else None
+
+    def write_pending(self, conn: sqlite3.Connection, height: Optional[int] = None):
+        """Write pending adds, spends and key images on conn without committing.
+
+        Called by the block store inside the transaction adding the block at
+        height, so both land together. mark_written() must follow a commit.
+        """
+        with self._lock:
+            self._write(conn, height)
+
+    def _write(self, conn: sqlite3.Connection, height: Optional[int]):
+        conn.executemany(
+            'INSERT INTO key_images (image, height) VALUES (?, ?)',
+            self._new_images.items()
+        )
+        conn.executemany(
+            'DELETE FROM utxos WHERE outpoint = ?',
+            [(key,) for key, value in self._dirty.items() if value is None]
+        )
+        conn.executemany(
+            'INSERT OR REPLACE INTO utxos (outpoint, value) VALUES (?, ?)',
+            [(key, value) for key, value in self._dirty.items() if value is not None]
+        )
+        if height is not None:
+            conn.execute(
+                'INSERT OR REPLACE INTO utxo_state (id, height) VALUES (0, ?)', (height,)
+            )
+
+    def mark_written(self):
+        """Move pending changes to the read cache once their write committed"""
+        with self._lock:
+            for key, value in self._dirty.items():
+                if value is not None:
+                    self._cache(key, value)
+            self._dirty.clear()
+            self._new_images.clear()
+
+            # Keep the false positive rate down as the set grows
+            if self._images.full:
+                self._load_key_images(self._images.capacity)
+
+    def flush(self, height: Optional[int] = None):
+        """Write pending changes in a transaction of their own"""
+        with self._lock:
+            if not self._dirty and not self._new_images and height is None:
+                return
+            with self._conn:
+                self._write(self._conn, height)
+        self.mark_written()
+
+    def reset(self):
+        """Delete every output, key image and the stored height"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute('DELETE FROM utxos')
+                self._conn.execute('DELETE FROM key_images')
+                self._conn.execute('DELETE FROM utxo_state')
+            self._dirty.clear()
+            self._clean.clear()
+            self._new_images.clear()
+            self._load_key_images(self._images.capacity)
+
+    def discard_pending(self):
+        """Drop adds, spends and key images not yet flushed"""
+        with self._lock:
+            self._dirty.clear()
+            self._new_images.clear()
+            self._load_key_images(self._images.capacity)
+
+    def _load_key_images(self, capacity: int):
+        """Rebuild the Bloom filter from the stored key images"""
+        (count,) = self._conn.execute('SELECT COUNT(*) FROM key_images').fetchone()
+        rows = self._conn.execute('SELECT image FROM key_images')
+        self._images = KeyImageIndex.load(count, (image for (image,) in rows), capacity)
+
+    def _cache(self, key: bytes, value: bytes):
+        self._clean[key] = value
+        self._clean.move_to_end(key)
+        while len(self._clean) > self.cache_size:
+            self._clean.popitem(last=False)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
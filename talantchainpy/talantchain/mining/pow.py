@@ -2,7 +2,7 @@ import time
 from typing import List, Optional
 from ..core.block import Block, BlockHeader
 from ..core.transaction import Transaction
-from ..crypto.hash import Hash
+from ..crypto.hash import Hash, ZERO_HASH
 
 class ProofOfWork:
     def __init__(self, initial_difficulty: int = 1):
@@ -15,7 +15,7 @@ class ProofOfWork:
         header = BlockHeader(
             version=1,
             prev_hash=prev_hash,
-            merkle_root=Hash(),  # Temporary, will be calculated
+            merkle_root=ZERO_HASH,  # Temporary, will be calculated
             timestamp=int(time.time()),
             difficulty=self.difficulty,
             nonce=0
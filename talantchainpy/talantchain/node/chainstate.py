@@ -0,0 +1,81 @@
+"""In-memory chain state for TalantChain node"""
+
+from array import array
+from typing import List
+from ..database.db import Database
+
+class HeaderIndex:
+    """Compact in-memory index of block headers.
+
+    Heights, timestamps and difficulties are kept in typed arrays and hashes
+    as raw 32-byte slices of one bytearray, so the index stays small as the
+    chain grows. Cumulative work needs arbitrary precision and is kept in a
+    plain list.
+    """
+
+    HASH_SIZE = 32
+    GENESIS_HASH = "0" * 64
+
+    def __init__(self):
+        self.heights = array('q')
+        self.timestamps = array('q')
+        self.difficulties = array('q')
+        self.hashes = bytearray()
+        self.cumulative_work: List[int] = []
+
+    @classmethod
+    def load(cls, db: Database) -> 'HeaderIndex':
+        """Load header index from database"""
+        index = cls()
+        for height, block_hash, timestamp, difficulty in db.get_headers():
+            index.append(height, block_hash, timestamp, difficulty)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.heights)
+
+    @property
+    def height(self) -> int:
+        """Current chain height"""
+        return self.heights[-1] if self.heights else 0
+
+    @property
+    def tip_hash(self) -> str:
+        """Hash of latest block"""
+        return self.hash_at(-1) if self.heights else self.GENESIS_HASH
+
+    @property
+    def difficulty(self) -> int:
+        """Current mining difficulty"""
+        return self.difficulties[-1] if self.difficulties else 1
+
+    @property
+    def total_work(self) -> int:
+        """Cumulative work of the chain"""
+        return self.cumulative_work[-1] if self.cumulative_work else 0
+
+    def hash_at(self, index: int) -> str:
+        """Get hash of block at index"""
+        if index < 0:
+            index += len(self.heights)
+        start = index * self.HASH_SIZE
+        return self.hashes[start:start + self.HASH_SIZE].hex()
+
+    def append(self, height: int, block_hash: str, timestamp: int, difficulty: int):
+        """Add header of a newly applied block"""
+        self.heights.append(height)
+        self.timestamps.append(timestamp)
+        self.difficulties.append(difficulty)
+        self.hashes += bytes.fromhex(block_hash)
+        self.cumulative_work.append(self.total_work + 2 ** difficulty)
+
+    def set_difficulty(self, difficulty: int):
+        """Update difficulty of latest block"""
+        if not self.difficulties:
+            return
+        self.cumulative_work[-1] += 2 ** difficulty - 2 ** self.difficulties[-1]
+        self.difficulties[-1] = difficulty
+
+    def recent_timestamps(self, n: int) -> List[int]:
+        """Get timestamps of the last n blocks, oldest first"""
+        return self.timestamps[-n:].tolist()
@@ -0,0 +1,132 @@
+"""Transaction memory pool for TalantChain"""
+
+import itertools
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from sortedcontainers import SortedList
+from ..core.transaction import Transaction
+
+class MempoolEntry:
+    __slots__ = ('tx', 'hash', 'size', 'arrival', 'priority')
+
+    def __init__(self, tx: Transaction, size: int, arrival: float, seq: int):
+        self.tx = tx
+        self.hash = tx.hash
+        self.size = size
+        self.arrival = arrival
+        # Highest fee rate first, then first come first served
+        self.priority = (-(tx.fee / size), seq, self.hash)
+
+class Mempool:
+    """Pending transactions indexed by hash, sender, key image, priority and arrival.
+
+    The priority index is a sorted list keyed by (fee rate, arrival), so
+    insert/remove are O(log n) and picking the best k transactions is O(k).
+    The hash index is kept in arrival order and doubles as the expiry index.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, expiry: int = 3600):
+        self.max_bytes = max_bytes
+        self.expiry = expiry
+        self.total_bytes = 0
+        self.version = 0  # Bumped on every change
+        self._by_hash: 'OrderedDict[str, MempoolEntry]' = OrderedDict()
+        self._by_sender: Dict[str, Set[str]] = {}
+        self._by_key_image: Dict[bytes, str] = {}
+        self._by_priority = SortedList()
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._by_hash)
+
+    def __contains__(self, tx_hash: str) -> bool:
+        return tx_hash in self._by_hash
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return (entry.tx for entry in self._by_hash.values())
+
+    def get(self, tx_hash: str) -> Optional[Transaction]:
+        """Get transaction by hash"""
+        entry = self._by_hash.get(tx_hash)
+        return entry.tx if entry else None
+
+    def by_sender(self, sender: str) -> List[Transaction]:
+        """Get pending transactions from sender"""
+        return [self._by_hash[h].tx for h in self._by_sender.get(sender, ())]
+
+    def by_key_image(self, image: bytes) -> Optional[Transaction]:
+        """Get pending transaction spending key image"""
+        tx_hash = self._by_key_image.get(image)
+        return self._by_hash[tx_hash].tx if tx_hash else None
+
+    def add(self, tx: Transaction):
+        """Add transaction, evicting the lowest fee rate ones if full"""
+        if tx.hash in self._by_hash:
+            raise ValueError("Transaction already in mempool")
+        if tx.key_image and tx.key_image in self._by_key_image:
+            raise ValueError("Key image already spent in mempool")
+
+        size = len(tx.to_bytes())
+        entry = MempoolEntry(tx, size, time.time(), next(self._seq))
+        self._insert(entry)
+
+        while self.total_bytes > self.max_bytes:
+            lowest = self._by_priority[-1][2]
+            self._remove(lowest)
+            if lowest == entry.hash:
+                raise ValueError("Mempool full")
+
+        self.version += 1
+
+    def remove(self, tx_hash: str) -> Optional[Transaction]:
+        """Remove transaction by hash"""
+        entry = self._remove(tx_hash)
+        if entry:
+            self.version += 1
+        return entry.tx if entry else None
+
+    def remove_many(self, tx_hashes: Iterable[str]) -> int:
+        """Remove a batch of transactions, e.g. those included in a block"""
+        removed = sum(1 for h in tx_hashes if self._remove(h))
+        if removed:
+            self.version += 1
+        return removed
+
+    def best(self, k: int) -> List[Transaction]:
+        """Get the k highest priority transactions"""
+        return [self._by_hash[key[2]].tx for key in self._by_priority.islice(0, k)]
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Remove transactions older than the expiry time"""
+        cutoff = (now or time.time()) - self.expiry
+        expired = []
+        for tx_hash, entry in self._by_hash.items():
+            if entry.arrival >= cutoff:
+                break
+            expired.append(tx_hash)
+        return self.remove_many(expired)
+
+    def _insert(self, entry: MempoolEntry):
+        self._by_hash[entry.hash] = entry
+        self._by_sender.setdefault(entry.tx.sender, set()).add(entry.hash)
+        if entry.tx.key_image:
+            self._by_key_image[entry.tx.key_image] = entry.hash
+        self._by_priority.add(entry.priority)
+        self.total_bytes += entry.size
+
+    def _remove(self, tx_hash: str) -> Optional[MempoolEntry]:
+        entry = self._by_hash.pop(tx_hash, None)
+        if entry is None:
+            return None
+
+        hashes = self._by_sender[entry.tx.sender]
+        hashes.discard(tx_hash)
+        if not hashes:
+            del self._by_sender[entry.tx.sender]
+        if entry.tx.key_image:
+            self._by_key_image.pop(entry.tx.key_image, None)
+
+        self._by_priority.remove(entry.priority)
+        self.total_bytes -= entry.size
+        return entry
@@ -5,11 +5,23 @@ import aiohttp
 from aiohttp import web
 import json
 import time
-from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from ..crypto.hash import Hash
+from ..crypto.sigcache import signature_cache
+from ..crypto.verifier import VerifierBusy
+from ..core.bloom import KeyImageIndex
 from ..core.transaction import Transaction
+from ..core.validation import BlockValidator
+from ..config import MINING_REWARD_INITIAL, SNAPSHOT_INTERVAL
 from ..database.db import Database
+from ..units import format_amount, to_atomic
+from ..database.async_db import AsyncDatabase
+from ..database.snapshot import write_snapshot
+from .mempool import Mempool
+from .template_cache import BlockTemplateCache
+from .chainstate import HeaderIndex
+
+MAX_BATCH_SIZE = 10000  # Transactions per /transactions request
 
 class Node:
     def __init__(self, host: str = "localhost", port: int = 8080):
@@ -17,10 +29,14 @@ class Node:
         self.port = port
         self.app = web.Application()
         self.db = Database()
-        self.mempool: List[Transaction] = []
-        self.current_block_template = None
+        self.async_db = AsyncDatabase(self.db)
+        self.chain = HeaderIndex.load(self.db)
+        self.key_images = self.load_key_images()
+        self.mempool = Mempool()
+        self.template_cache = BlockTemplateCache()
+        self.validator = BlockValidator()  # Signature checks on worker processes
         self.current_miners: Dict[str, int] = {}  # address -> last_seen
-        self.block_reward = Decimal('50.0')
+        self.block_reward = MINING_REWARD_INITIAL  # Atomic units
         self.setup_routes()
 
     def setup_routes(self):
@@ -29,24 +45,85 @@ class Node:
         self.app.router.add_post('/submitblock', self.submit_block)
         self.app.router.add_get('/balance/{address}', self.get_balance)
         self.app.router.add_post('/transaction', self.submit_transaction)
+        self.app.router.add_post('/transactions', self.submit_transactions)
         self.app.router.add_get('/info', self.get_info)
+        self.app.router.add_get('/address/{address}/transactions', self.get_address_history)
+        self.app.router.add_get('/block/{block_id}', self.get_block)
+        self.app.router.add_get('/tx/{tx_hash}', self.get_transaction)
+        self.app.router.add_get('/supply', self.get_supply)
+        self.app.router.add_get('/richlist', self.get_rich_list)
 
     async def get_info(self, request: web.Request) -> web.Response:
         """Get blockchain info"""
         info = {
-            'height': self.db.get_height(),
-            'difficulty': self.db.get_difficulty(),
+            'height': self.chain.height,
+            'difficulty': self.chain.difficulty,
             'mempool_size': len(self.mempool),
             'active_miners': len(self.current_miners),
-            'block_reward': str(self.block_reward)
+            'block_reward': format_amount(self.block_reward),
+            'template_cache': self.template_cache.stats(),
+            'signature_cache': signature_cache.stats()
         }
         return web.json_response(info)
 
     async def get_balance(self, request: web.Request) -> web.Response:
         """Get address balance"""
         address = request.match_info['address']
-        balance = self.db.get_balance(address)
-        return web.json_response({'balance': str(balance)})
+        balance = await self.async_db.get_balance(address)
+        return web.json_response({'balance': format_amount(balance)})
+
+    async def get_supply(self, request: web.Request) -> web.Response:
+        """Get total coin supply"""
+        supply = await self.async_db.get_total_supply()
+        return web.json_response({'supply': format_amount(supply)})
+
+    async def get_rich_list(self, request: web.Request) -> web.Response:
+        """Get largest balances"""
+        try:
+            limit = min(max(int(request.rel_url.query.get('limit', 100)), 1), 1000)
+        except ValueError:
+            return web.Response(status=400, text="Invalid limit")
+        rich_list = await self.async_db.get_rich_list(limit)
+        return web.json_response([
+            {'address': address, 'balance': format_amount(amount)}
+            for address, amount in rich_list
+        ])
+
+    async def get_address_history(self, request: web.Request) -> web.Response:
+        """Get paginated transaction history for address"""
+        try:
+            address = request.match_info['address']
+            params = request.rel_url.query
+            limit = min(max(int(params.get('limit', 50)), 1), 500)
+            transactions, next_cursor = await self.async_db.get_address_history(
+                address, limit, params.get('cursor')
+            )
+            return web.json_response({
+                'transactions': transactions,
+                'next_cursor': next_cursor
+            })
+            
+        except Exception as e:
+            return web.Response(status=400, text=str(e))
+
+    async def get_block(self, request: web.Request) -> web.Response:
+        """Get block by height or hash"""
+        block = await self.async_db.get_block(request.match_info['block_id'])
+        if block is None:
+            return web.Response(status=404, text="Block not found")
+        return web.json_response(block)
+
+    async def get_transaction(self, request: web.Request) -> web.Response:
+        """Get confirmed transaction by hash"""
+        tx_hash = request.match_info['tx_hash']
+        tx = self.mempool.get(tx_hash)
+        if tx is not None:
+            return web.json_response(dict(tx.to_dict(), block_height=None))
+            
+        tx_data = await self.async_db.get_transaction(tx_hash)
+        if tx_data is None:
+            return web.Response(status=404, text="Transaction not found")
+        return web.json_response(tx_data)
 
     async def submit_transaction(self, request: web.Request) -> web.Response:
         """Submit new transaction"""
@@ -54,43 +131,125 @@ class Node:
             data = await request.json()
             tx = Transaction.from_dict(data)
             
-            # Verify transaction
-            if not tx.verify():
+            # Verify transaction on the verification workers
+            if not (await self.validator.verify_many_async([tx]))[0]:
                 return web.Response(status=400, text="Invalid transaction signature")
                 
+            # Reject reuse of a key image spent on chain
+            if await self.spent_key_images([tx]):
+                return web.Response(status=400, text="Key image already spent")
+                
             # Check sender has enough balance
-            balance = self.db.get_balance(tx.sender)
-            if balance < tx.amount:
+            balance = await self.async_db.get_balance(tx.sender)
+            if balance < to_atomic(tx.amount) + to_atomic(tx.fee):
                 return web.Response(status=400, text="Insufficient balance")
                 
             # Add to mempool
-            self.mempool.append(tx)
+            self.mempool.add(tx)
             return web.Response(status=200)
             
+        except VerifierBusy as e:
+            return web.Response(status=503, text=str(e))
         except Exception as e:
             return web.Response(status=400, text=str(e))
 
-    def create_block_template(self, miner_address: str) -> dict:
-        """Create new block template"""
-        height = self.db.get_height() + 1
-        prev_hash = self.db.get_latest_block_hash()
-        timestamp = int(time.time())
-        difficulty = self.db.get_difficulty()
+    async def submit_transactions(self, request: web.Request) -> web.Response:
+        """Submit a batch of transactions as a JSON array or NDJSON.
+
+        Returns one result per transaction, in order. Signatures are checked
+        in parallel and each sender's balance must cover all of its accepted
+        transactions in the batch together.
+        """
+        body = await request.read()
+        try:
+            text = body.decode().strip()
+            if text.startswith('['):
+                items = json.loads(text)
+            else:
+                items = [json.loads(line) for line in text.splitlines() if line.strip()]
+        except (UnicodeDecodeError, ValueError) as e:
+            return web.Response(status=400, text=f"Invalid batch: {e}")
+        if len(items) > MAX_BATCH_SIZE:
+            return web.Response(status=413, text=f"Batch exceeds {MAX_BATCH_SIZE} transactions")
+            
+        results: List[Optional[Dict]] = [None] * len(items)
+        parsed = []
+        for i, item in enumerate(items):
+            try:
+                tx = Transaction.from_dict(item)
+                # Encode now so a bad field rejects this item, not the batch
+                tx.to_bytes()
+                tx.hash_bytes
+                parsed.append((i, tx, to_atomic(tx.amount) + to_atomic(tx.fee)))
+            except Exception as e:
+                results[i] = {'status': 'rejected', 'error': f"Invalid transaction: {e}"}
+                
+        # Verify signatures off the event loop, in parallel
+        try:
+            valid = await self.validator.verify_many_async([tx for _, tx, _ in parsed])
+        except VerifierBusy as e:
+            return web.Response(status=503, text=str(e))
         
-        # Get transactions from mempool
-        transactions = self.mempool[:10]  # Limit to 10 transactions per block
+        # Check balances against the combined spend of each sender
+        balances = await self.async_db.get_balances([tx.sender for _, tx, _ in parsed])
+        spent = await self.spent_key_images([tx for _, tx, _ in parsed])
+        for (i, tx, cost), ok in zip(parsed, valid):
+            if not ok:
+                results[i] = {'status': 'rejected', 'hash': tx.hash, 'error': "Invalid transaction signature"}
+                continue
+            if tx.key_image in spent:
+                results[i] = {'status': 'rejected', 'hash': tx.hash, 'error': "Key image already spent"}
+                continue
+            if balances[tx.sender] < cost:
+                results[i] = {'status': 'rejected', 'hash': tx.hash, 'error': "Insufficient balance"}
+                continue
+            try:
+                self.mempool.add(tx)
+            except ValueError as e:
+                results[i] = {'status': 'rejected', 'hash': tx.hash, 'error': str(e)}
+                continue
+            balances[tx.sender] -= cost
+            results[i] = {'status': 'accepted', 'hash': tx.hash}
+            
+        accepted = sum(1 for result in results if result['status'] == 'accepted')
+        return web.json_response({
+            'accepted': accepted,
+            'rejected': len(results) - accepted,
+            'results': results
+        })
+
+    def load_key_images(self) -> KeyImageIndex:
+        """Build the spent key image filter from stored blocks"""
+        return KeyImageIndex.load(self.db.count_key_images(), self.db.iter_key_images())
+
+    async def spent_key_images(self, txs: List[Transaction]) -> Set[bytes]:
+        """Get key images of txs that stored blocks already spent"""
+        # The filter clears nearly every image without a database read
+        candidates = [tx.key_image for tx in txs
+                      if tx.key_image and tx.key_image in self.key_images]
+        if not candidates:
+            return set()
+        return await self.async_db.read(self.db.get_spent_key_images, candidates)
+
+    async def create_block_template(self, miner_address: str) -> bytes:
+        """Create new JSON-encoded block template"""
+        key = self.template_cache.key(self.mempool.version)
+        body = self.template_cache.get(key)
         
-        template = {
-            'height': height,
-            'previous_hash': prev_hash,
-            'timestamp': timestamp,
-            'difficulty': difficulty,
-            'transactions': [tx.to_dict() for tx in transactions],
-            'miner_address': miner_address,
-            'reward': str(self.block_reward)
-        }
+        if body is None:
+            # Get highest priority transactions from mempool
+            transactions = self.mempool.best(10)  # Limit to 10 transactions per block
+            
+            body = self.template_cache.put(key, {
+                'height': self.chain.height + 1,
+                'previous_hash': self.chain.tip_hash,
+                'difficulty': self.chain.difficulty,
+                'transactions': [tx.to_dict() for tx in transactions],
+                'reward': format_amount(self.block_reward)
+            })
         
-        return template
+        # Patch in miner-specific fields
+        return self.template_cache.render(body, miner_address, int(time.time()))
 
     async def get_block_template(self, request: web.Request) -> web.Response:
         """Get block template for mining"""
@@ -104,8 +263,8 @@ class Node:
             self.current_miners[miner_address] = int(time.time())
             
             # Create new template
-            template = self.create_block_template(miner_address)
-            return web.json_response(template)
+            template = await self.create_block_template(miner_address)
+            return web.Response(body=template, content_type='application/json')
             
         except Exception as e:
             return web.Response(status=400, text=str(e))
@@ -123,47 +282,80 @@ class Node:
             if hash_int >= target:
                 return web.Response(status=400, text="Block hash does not meet difficulty")
                 
-            # Process block reward
-            miner_address = block_data['miner_address']
-            self.db.add_balance(miner_address, self.block_reward)
-            
-            # Process transactions
-            for tx_data in block_data['transactions']:
-                tx = Transaction.from_dict(tx_data)
-                # Deduct from sender
-                self.db.subtract_balance(tx.sender, tx.amount)
-                # Add to recipient
-                self.db.add_balance(tx.recipient, tx.amount)
-                # Remove from mempool
-                self.mempool = [t for t in self.mempool if t.hash != tx.hash]
+            if len(bytes.fromhex(block_data['hash'])) != HeaderIndex.HASH_SIZE:
+                return web.Response(status=400, text="Invalid block hash")
+                
+            if len(bytes.fromhex(block_data['previous_hash'])) != HeaderIndex.HASH_SIZE:
+                return web.Response(status=400, text="Invalid previous hash")
+                
+            if to_atomic(block_data['reward']) != self.block_reward:
+                return web.Response(status=400, text="Invalid block reward")
                 
-            # Save block
-            self.db.add_block(block_data)
+            transactions = [Transaction.from_dict(tx_data) for tx_data in block_data['transactions']]
+            
+            # Store the hashes computed here, not the ones the miner sent
+            block_data['transactions'] = [
+                dict(tx_data, hash=tx.hash)
+                for tx_data, tx in zip(block_data['transactions'], transactions)
+            ]
+            
+            # Relayed transactions hit the signature cache, the rest are
+            # checked on the verification workers
+            if not all(await self.validator.verify_many_async(transactions)):
+                return web.Response(status=400, text="Invalid transaction signature")
+            
+            # Apply reward, transfers, key images and block rows atomically;
+            # a key image spent before fails the whole block
+            await self.async_db.apply_block(block_data, self.block_reward)
+            self.chain.append(
+                block_data['height'],
+                block_data['hash'],
+                block_data['timestamp'],
+                block_data['difficulty']
+            )
+            
+            # Remove included transactions from mempool
+            self.mempool.remove_many(tx.hash for tx in transactions)
+            
+            # Record spent key images and drop pending txs reusing them
+            images = [tx.key_image for tx in transactions if tx.key_image]
+            if images:
+                self.key_images.update(images)
+                conflicts = [self.mempool.by_key_image(image) for image in images]
+                self.mempool.remove_many(tx.hash for tx in conflicts if tx)
+                if self.key_images.full:
+                    self.key_images = await self.async_db.read(self.load_key_images)
+            
+            # Chain tip changed, drop cached template
+            self.template_cache.invalidate()
             
             # Update difficulty if needed
-            self.adjust_difficulty()
+            await self.adjust_difficulty()
             
             return web.Response(status=200)
             
         except Exception as e:
             return web.Response(status=400, text=str(e))
 
-    def adjust_difficulty(self):
+    async def adjust_difficulty(self):
         """Adjust mining difficulty based on block time"""
-        # Get last 10 blocks
-        blocks = self.db.get_last_n_blocks(10)
-        if len(blocks) < 2:
+        # Get timestamps of last 10 blocks, oldest first
+        times = self.chain.recent_timestamps(10)
+        if len(times) < 2:
             return
             
         # Calculate average block time
-        times = [b['timestamp'] for b in blocks]
         avg_time = (times[-1] - times[0]) / (len(times) - 1)
         
         # Target block time is 60 seconds
         if avg_time < 30:  # Too fast
-            self.db.increase_difficulty()
-        elif avg_time > 90:  # Too slow
-            self.db.decrease_difficulty()
+            await self.async_db.increase_difficulty()
+            self.chain.set_difficulty(self.chain.difficulty + 1)
+            self.template_cache.invalidate()
+        elif avg_time > 90 and self.chain.difficulty > 1:  # Too slow
+            await self.async_db.decrease_difficulty()
+            self.chain.set_difficulty(self.chain.difficulty - 1)
+            self.template_cache.invalidate()
 
     async def start(self):
         """Start node"""
@@ -175,6 +367,8 @@ class Node:
         
         # Start background tasks
         asyncio.create_task(self.cleanup_old_miners())
+        asyncio.create_task(self.expire_mempool())
+        asyncio.create_task(self.snapshot_balances())
         
         # Keep server running
         while True:
@@ -183,6 +377,8 @@ class Node:
     async def stop(self):
         """Stop node"""
         await self.app.shutdown()
+        await asyncio.get_running_loop().run_in_executor(None, self.async_db.close)
+        self.validator.close()
 
     async def cleanup_old_miners(self):
         """Remove inactive miners"""
@@ -194,3 +390,22 @@ class Node:
                 if current_time - last_seen < 300  # 5 minutes timeout
             }
             await asyncio.sleep(60)  # Check every minute
+
+    async def expire_mempool(self):
+        """Remove expired transactions from mempool"""
+        while True:
+            self.mempool.expire()
+            await asyncio.sleep(300)  # Check every 5 minutes
+
+    async def snapshot_balances(self):
+        """Periodically snapshot balances for fast rebuilds"""
+        last_height = None
+        while True:
+            await asyncio.sleep(SNAPSHOT_INTERVAL)
+            if self.chain.height == last_height:
+                continue
+            try:
+                await self.async_db.read(write_snapshot, self.db)
+                last_height = self.chain.height
+            except Exception as e:
+                print(f"Error writing balance snapshot: {e}")
@@ -0,0 +1,63 @@
+"""Block template cache for TalantChain node"""
+
+import json
+from typing import Dict, Hashable, Optional, Tuple
+
+class BlockTemplateCache:
+    """Pre-encoded block template body shared by all miners.
+
+    The body holds everything except the miner-specific fields and is keyed
+    by (generation, mempool version). The generation is bumped by
+    invalidate() whenever the chain tip changes, so a template built while a
+    block was being applied is never served afterwards.
+    """
+
+    def __init__(self):
+        self._generation = 0
+        self._key: Optional[Tuple[int, Hashable]] = None
+        self._body = b''
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, mempool_version: Hashable) -> Tuple[int, Hashable]:
+        """Get cache key for the current tip and mempool version"""
+        return (self._generation, mempool_version)
+
+    def get(self, key: Tuple[int, Hashable]) -> Optional[bytes]:
+        """Get cached body, or None if stale"""
+        if key == self._key:
+            self.hits += 1
+            return self._body
+        self.misses += 1
+        return None
+
+    def put(self, key: Tuple[int, Hashable], template: Dict) -> bytes:
+        """Encode and cache template body"""
+        # Leave the object open so per-miner fields can be appended
+        body = json.dumps(template).encode()[:-1]
+        if key[0] == self._generation:
+            self._key = key
+            self._body = body
+        return body
+
+    def invalidate(self):
+        """Drop cached body after the chain tip changes"""
+        self._generation += 1
+        self._key = None
+        self._body = b''
+
+    @staticmethod
+    def render(body: bytes, miner_address: str, timestamp: int) -> bytes:
+        """Patch miner-specific fields into a cached body"""
+        return b'%s, "miner_address": %s, "timestamp": %d}' % (
+            body, json.dumps(miner_address).encode(), timestamp
+        )
+
+    def stats(self) -> Dict:
+        """Get hit-rate metrics"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
@@ -4,6 +4,7 @@ import asyncio
 from typing import Dict, List, Optional, Set
 from ..core.block import Block
 from ..core.transaction import Transaction
+from ..core.validation import BlockValidator
 from ..mining.miner import Miner
 from decimal import Decimal
 import time
@@ -16,6 +17,7 @@ class Node:
         self.peers: Dict[str, 'Node'] = {}
         self.blockchain = []  # Simplified for this example
         self.mempool: List[Transaction] = []
+        self.validator = BlockValidator()  # Signature checks on worker processes
         self.miner: Optional[Miner] = None
         self.server = None
         self.current_block_height = 0
@@ -52,6 +54,7 @@ class Node:
         if self.server:
             self.server.close()
             await self.server.wait_closed()
+        self.validator.close()
         self.is_running = False
         
     async def handle_connection(self, reader, writer):
@@ -126,10 +129,10 @@ class Node:
                           if current_time - tx.timestamp < 3600]  # Remove after 1 hour
             await asyncio.sleep(300)  # Clean every 5 minutes
             
-    def add_block(self, block: Block) -> bool:
+    async def add_block(self, block: Block) -> bool:
         """Add a new block to the blockchain"""
         # Verify block
-        if self.verify_block(block):
+        if await self.verify_block(block):
             self.blockchain.append(block)
             self.current_block_height += 1
             
@@ -145,7 +148,20 @@ class Node:
             return True
         return False
         
-    def verify_block(self, block: Block) -> bool:
+    async def add_transaction(self, tx: Transaction) -> bool:
+        """Add a relayed transaction to the mempool"""
+        # Verify off the event loop, the verifier may wait for capacity
+        try:
+            if not (await self.validator.verify_many_async([tx]))[0]:
+                return False
+        except Exception:
+            return False
+        if any(pending.hash == tx.hash for pending in self.mempool):
+            return False
+        self.mempool.append(tx)
+        return True
+        
+    async def verify_block(self, block: Block) -> bool:
         """Verify block validity"""
         try:
             # Check block hash meets difficulty
@@ -153,10 +169,6 @@ class Node:
                 return False
                 
             # Verify transactions
-            for tx in block.transactions:
-                if not tx.verify():
-                    return False
-                    
-            return True
+            return all(await self.validator.verify_many_async(block.transactions))
         except Exception:
             return False
@@ -1,7 +1,7 @@
 import asyncio
 import json
 from typing import Any, Dict, Optional, List
-from ..core.block import Block
+from ..core.block import Block, BlockHeader
 from ..core.transaction import Transaction
 from ..crypto.hash import Hash
 
@@ -86,7 +86,7 @@ class P2PProtocol:
     
     async def send_transaction(self, tx: Transaction):
         """Send a transaction to peer"""
-        await self.send_message('transaction', tx.to_dict())
+        await self.send_message('transaction', self._serialize_transaction(tx))
     
     async def handle_block(self, payload: Dict):
         """Handle received block"""
@@ -101,14 +101,14 @@ class P2PProtocol:
         except Exception as e:
             print(f"Error handling block: {e}")
     
-    async def handle_transaction(self, payload: Dict):
+    async def handle_transaction(self, payload: Any):
         """Handle received transaction"""
         try:
             # Convert payload back to Transaction object
-            tx = Transaction.from_dict(payload)
+            tx = self._deserialize_transaction(payload)
             
             # Verify and add to mempool
-            if self.node.add_transaction(tx):
+            if await self.node.add_transaction(tx):
                 # Broadcast to other peers
                 await self.node.broadcast_transaction(tx)
         except Exception as e:
@@ -209,41 +209,15 @@ class P2PProtocol:
                        for tx_data in data['transactions']]
         return Block(header=header, transactions=transactions)
     
-    def _serialize_transaction(self, tx: Transaction) -> Dict[str, Any]:
-        """Serialize transaction to JSON-compatible format"""
-        return {
-            'version': tx.version,
-            'inputs': [{
-                'prev_tx': str(input.prev_tx),
-                'index': input.index,
-                'signature': input.signature.hex() if input.signature else None
-            } for input in tx.inputs],
-            'outputs': [{
-                'amount': output.amount,
-                'public_key': output.public_key.hex()
-            } for output in tx.outputs],
-            'lock_time': tx.lock_time
-        }
+    def _serialize_transaction(self, tx: Transaction) -> str:
+        """Serialize transaction to hex of its binary encoding"""
+        return tx.to_bytes().hex()
     
-    def _deserialize_transaction(self, data: Dict[str, Any]) -> Transaction:
-        """Deserialize transaction from JSON-compatible format"""
-        inputs = [TxInput(
-            prev_tx=Hash.from_string(input['prev_tx']),
-            index=input['index'],
-            signature=bytes.fromhex(input['signature']) if input['signature'] else None
-        ) for input in data['inputs']]
-        
-        outputs = [TxOutput(
-            amount=output['amount'],
-            public_key=bytes.fromhex(output['public_key'])
-        ) for output in data['outputs']]
-        
-        return Transaction(
-            version=data['version'],
-            inputs=inputs,
-            outputs=outputs,
-            lock_time=data['lock_time']
-        )
+    def _deserialize_transaction(self, data: Any) -> Transaction:
+        """Deserialize transaction from hex, or from a dict sent by older peers"""
+        if isinstance(data, dict):
+            return Transaction.from_dict(data)
+        return Transaction.from_bytes(bytes.fromhex(data))
     
     async def _send_message(self, msg_type: str, payload: Dict[str, Any]):
         """Send message to peer"""
@@ -10,6 +10,7 @@ from aiohttp import web
 import logging
 import base64
 from ..crypto.hash import Hash
+from ..units import format_amount, to_atomic
 from ..mining.miner import RandomXLite, Block
 
 class PoolWorker:
@@ -20,20 +21,20 @@ class PoolWorker:
         self.invalid_shares = 0
         self.last_share = 0
         self.hashrate = 0.0
-        self.total_paid = Decimal('0')
+        self.total_paid = 0  # Atomic units
 
 class MiningPool:
     def __init__(self, pool_address: str, fee: float = 0.01, min_payout: Decimal = Decimal('1.0')):
         self.pool_address = pool_address
         self.fee = fee  # 1% default fee
-        self.min_payout = min_payout
+        self.min_payout = to_atomic(min_payout)
         self.workers: Dict[str, PoolWorker] = {}
         self.current_block: Optional[Block] = None
         self.shares_this_round = 0
         self.total_shares = 0
         self.total_blocks_found = 0
-        self.total_rewards = Decimal('0')
-        self.pending_payments: Dict[str, Decimal] = {}
+        self.total_rewards = 0
+        self.pending_payments: Dict[str, int] = {}  # Atomic units
         self.randomx = RandomXLite()
         self.node_url = "http://localhost:8080"
         self.last_block_time = time.time()
@@ -103,20 +104,19 @@ class MiningPool:
                 ) as response:
                     if response.status == 200:
                         self.total_blocks_found += 1
-                        reward = block.reward
+                        reward = to_atomic(block.reward)
                         self.total_rewards += reward
                         
-                        # Calculate rewards
-                        pool_fee = reward * Decimal(str(self.fee))
+                        # Calculate rewards, rounding down so dust stays with the pool
+                        pool_fee = int(reward * Decimal(str(self.fee)))
                         miner_reward = reward - pool_fee
 
                         # Distribute rewards based on shares
                         for worker in self.workers.values():
                             if worker.shares > 0:
-                                share_percent = worker.shares / self.shares_this_round
-                                worker_reward = miner_reward * Decimal(str(share_percent))
+                                worker_reward = miner_reward * worker.shares // self.shares_this_round
                                 self.pending_payments[worker.address] = (
-                                    self.pending_payments.get(worker.address, Decimal('0')) + 
+                                    self.pending_payments.get(worker.address, 0) + 
                                     worker_reward
                                 )
 
@@ -124,7 +124,7 @@ class MiningPool:
                         self.shares_this_round = 0
                         self.last_block_time = time.time()
                         
-                        logging.info(f"Block found! Height: {block.height}, Reward: {reward} TLNT")
+                        logging.info(f"Block found! Height: {block.height}, Reward: {format_amount(reward)} TLNT")
             except Exception as e:
                 logging.error(f"Error submitting block: {e}")
 
@@ -139,7 +139,7 @@ class MiningPool:
                             payment_data = {
                                 'from_address': self.pool_address,
                                 'to_address': address,
-                                'amount': str(amount)
+                                'amount': format_amount(amount)
                             }
                             async with session.post(
                                 f"{self.node_url}/sendtransaction",
@@ -151,8 +151,8 @@ class MiningPool:
                                         if worker.address == address:
                                             worker.total_paid += amount
                                     # Clear pending payment
-                                    self.pending_payments[address] = Decimal('0')
-                                    logging.info(f"Payment sent to {address}: {amount} TLNT")
+                                    self.pending_payments[address] = 0
+                                    logging.info(f"Payment sent to {address}: {format_amount(amount)} TLNT")
             except Exception as e:
                 logging.error(f"Error processing payments: {e}")
             await asyncio.sleep(60)  # Check payments every minute
@@ -170,9 +170,9 @@ class MiningPool:
             'total_shares': self.total_shares,
             'shares_this_round': self.shares_this_round,
             'total_blocks_found': self.total_blocks_found,
-            'total_rewards': str(self.total_rewards),
+            'total_rewards': format_amount(self.total_rewards),
             'fee': self.fee,
-            'min_payout': str(self.min_payout)
+            'min_payout': format_amount(self.min_payout)
         }
 
     def get_worker_stats(self, address: str) -> List[dict]:
@@ -185,7 +185,7 @@ class MiningPool:
                     'shares': worker.shares,
                     'invalid_shares': worker.invalid_shares,
                     'hashrate': worker.hashrate,
-                    'total_paid': str(worker.total_paid),
-                    'pending_payment': str(self.pending_payments.get(address, Decimal('0')))
+                    'total_paid': format_amount(worker.total_paid),
+                    'pending_payment': format_amount(self.pending_payments.get(address, 0))
                 })
         return worker_stats
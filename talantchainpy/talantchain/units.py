@@ -0,0 +1,28 @@
+"""Amount units for TalantChain"""
+
+from decimal import Decimal, InvalidOperation
+from typing import Union
+
+COIN = 100000000  # Atomic units per TLNT
+MAX_AMOUNT = 2 ** 63 - 1  # Fits a signed 64-bit SQLite integer
+ATOM = Decimal('0.00000001')
+
+def to_atomic(amount: Union[Decimal, str, int]) -> int:
+    """Convert TLNT amount to integer atomic units"""
+    try:
+        value = Decimal(str(amount)) * COIN
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {amount}")
+    if value != value.to_integral_value():
+        raise ValueError("Amount has more than 8 decimal places")
+    if not 0 <= value <= MAX_AMOUNT:
+        raise ValueError("Amount out of range")
+    return int(value)
+
+def from_atomic(units: int) -> Decimal:
+    """Convert integer atomic units to TLNT amount"""
+    return (Decimal(units) / COIN).quantize(ATOM)
+
+def format_amount(units: int) -> str:
+    """Format atomic units as a fixed-point TLNT string"""
+    return f"{from_atomic(units):f}"
@@ -3,7 +3,7 @@
 import os
 import json
 import base64
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from decimal import Decimal
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -19,6 +19,15 @@ class Wallet:
         self.private_key: Optional[PrivateKey] = None
         self.public_key: Optional[PublicKey] = None
         self.address: Optional[str] = None
+        self._session = None
+
+    @property
+    def session(self):
+        """Get HTTP session reused across node requests"""
+        import requests
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
 
     @property
     def exists(self) -> bool:
@@ -110,12 +119,11 @@ class Wallet:
 
     def get_balance(self, node_url: str = "http://localhost:8080") -> Decimal:
         """Get wallet balance from node"""
-        import requests
         if not self.address:
             raise ValueError("Wallet not loaded")
 
         try:
-            response = requests.get(f"{node_url}/balance/{self.address}")
+            response = self.session.get(f"{node_url}/balance/{self.address}")
             response.raise_for_status()
             data = response.json()
             return Decimal(data['balance'])
@@ -124,7 +132,6 @@ class Wallet:
 
     def send(self, recipient: str, amount: Decimal, node_url: str = "http://localhost:8080") -> str:
         """Send transaction to node"""
-        import requests
         if not self.private_key or not self.address:
             raise ValueError("Wallet not loaded")
 
@@ -133,7 +140,7 @@ class Wallet:
             tx = self.create_transaction(recipient, amount)
 
             # Send to node
-            response = requests.post(
+            response = self.session.post(
                 f"{node_url}/transaction",
                 json=tx.to_dict()
             )
@@ -143,6 +150,28 @@ class Wallet:
         except Exception as e:
             raise ValueError(f"Error sending transaction: {str(e)}")
 
+    def send_many(self, payments: List[Tuple[str, Decimal]],
+                  node_url: str = "http://localhost:8080") -> List[Dict]:
+        """Send several transactions in one batch request.
+
+        Returns the node's result for each payment, in order.
+        """
+        if not self.private_key or not self.address:
+            raise ValueError("Wallet not loaded")
+
+        try:
+            txs = [self.create_transaction(recipient, amount) for recipient, amount in payments]
+            body = '\n'.join(json.dumps(tx.to_dict()) for tx in txs)
+            response = self.session.post(
+                f"{node_url}/transactions",
+                data=body.encode(),
+                headers={'Content-Type': 'application/x-ndjson'}
+            )
+            response.raise_for_status()
+            return response.json()['results']
+        except Exception as e:
+            raise ValueError(f"Error sending transactions: {str(e)}")
+
     @staticmethod
     def list_wallets() -> list:
         """List all available wallets"""